@@ -0,0 +1,198 @@
+from sqlalchemy import case, func, select, tuple_
+
+from database import build_upsert
+from models import PlayerBoxScore, PlayerSeasonRollup, TeamBoxScore, TeamSeasonRollup
+
+# Number of game_ids or rollup keys handled per statement
+BATCH_SIZE = 500
+
+# Player box-score columns that can be averaged over rolling windows
+ROLLING_STATS = [
+    "minutes", "points", "rebounds", "offensive_rebounds", "defensive_rebounds",
+    "assists", "steals", "blocks", "turnovers", "fouls",
+    "field_goals_made", "field_goals_attempted",
+    "three_point_field_goals_made", "three_point_field_goals_attempted",
+    "free_throws_made", "free_throws_attempted",
+]
+
+
+def _total(column):
+    return func.coalesce(func.sum(column), 0)
+
+
+# Rollup column -> aggregate over the box-score rows of one (key, season) group
+PLAYER_ROLLUP_AGGREGATES = {
+    "games": _total(case((PlayerBoxScore.minutes > 0, 1), else_=0)),
+    "minutes": _total(PlayerBoxScore.minutes),
+    "points": _total(PlayerBoxScore.points),
+    "rebounds": _total(PlayerBoxScore.rebounds),
+    "assists": _total(PlayerBoxScore.assists),
+    "steals": _total(PlayerBoxScore.steals),
+    "blocks": _total(PlayerBoxScore.blocks),
+    "turnovers": _total(PlayerBoxScore.turnovers),
+    "field_goals_made": _total(PlayerBoxScore.field_goals_made),
+    "field_goals_attempted": _total(PlayerBoxScore.field_goals_attempted),
+    "three_point_field_goals_made": _total(PlayerBoxScore.three_point_field_goals_made),
+    "three_point_field_goals_attempted": _total(PlayerBoxScore.three_point_field_goals_attempted),
+    "free_throws_made": _total(PlayerBoxScore.free_throws_made),
+    "free_throws_attempted": _total(PlayerBoxScore.free_throws_attempted),
+}
+
+TEAM_ROLLUP_AGGREGATES = {
+    "games": func.count(),
+    "wins": _total(case((func.lower(TeamBoxScore.team_winner).in_(["true", "yes", "1"]), 1), else_=0)),
+    "points": _total(TeamBoxScore.team_score),
+    "opponent_points": _total(TeamBoxScore.opponent_team_score),
+    "rebounds": _total(TeamBoxScore.total_rebounds),
+    "assists": _total(TeamBoxScore.assists),
+    "steals": _total(TeamBoxScore.steals),
+    "blocks": _total(TeamBoxScore.blocks),
+    "turnovers": _total(TeamBoxScore.turnovers),
+    "field_goals_made": _total(TeamBoxScore.field_goals_made),
+    "field_goals_attempted": _total(TeamBoxScore.field_goals_attempted),
+    "three_point_field_goals_made": _total(TeamBoxScore.three_point_field_goals_made),
+    "three_point_field_goals_attempted": _total(TeamBoxScore.three_point_field_goals_attempted),
+    "free_throws_made": _total(TeamBoxScore.free_throws_made),
+    "free_throws_attempted": _total(TeamBoxScore.free_throws_attempted),
+}
+
+
+def _refresh_rollup(db, box_model, rollup_model, key_name, aggregates, game_ids, batch_size):
+    """
+    Recompute the rollup rows of every (key, season) group that has a box score in `game_ids`.
+    """
+    box = box_model.__table__
+    keys = [box.c[key_name], box.c.season]
+
+    # Find the groups touched by the new box scores
+    affected = set()
+    for start in range(0, len(game_ids), batch_size):
+        chunk = game_ids[start:start + batch_size]
+        query = select(*keys).distinct().where(box.c.game_id.in_(chunk), box.c.season.is_not(None))
+        affected.update(tuple(row) for row in db.execute(query))
+    affected = sorted(affected)
+
+    # Re-aggregate only those groups and upsert them into the rollup table
+    dialect_name = db.get_bind().dialect.name
+    for start in range(0, len(affected), batch_size):
+        chunk = affected[start:start + batch_size]
+        query = (
+            select(*keys, *[expr.label(name) for name, expr in aggregates.items()])
+            .where(tuple_(*keys).in_(chunk))
+            .group_by(*keys)
+        )
+        rows = [dict(row._mapping) for row in db.execute(query)]
+        if rows:
+            db.execute(build_upsert(dialect_name, rollup_model.__table__, rows, [key_name, "season"]))
+    return len(affected)
+
+
+def refresh_rollups(db, game_ids, batch_size=BATCH_SIZE):
+    """
+    Incrementally update the player and team season rollups for newly loaded box scores.
+    - `game_ids`: Games whose box scores were inserted or changed.
+    Returns the number of refreshed player and team rollup rows.
+    """
+    game_ids = sorted(set(game_ids))
+    counts = {
+        "players": _refresh_rollup(
+            db, PlayerBoxScore, PlayerSeasonRollup, "athlete_id", PLAYER_ROLLUP_AGGREGATES, game_ids, batch_size
+        ),
+        "teams": _refresh_rollup(
+            db, TeamBoxScore, TeamSeasonRollup, "team_id", TEAM_ROLLUP_AGGREGATES, game_ids, batch_size
+        ),
+    }
+    db.commit()
+    return counts
+
+
+def _ratio(numerator, denominator):
+    return round(numerator / denominator, 3) if denominator else None
+
+
+def _shooting(rollup):
+    return {
+        "field_goal_pct": _ratio(rollup.field_goals_made, rollup.field_goals_attempted),
+        "three_point_pct": _ratio(rollup.three_point_field_goals_made, rollup.three_point_field_goals_attempted),
+        "free_throw_pct": _ratio(rollup.free_throws_made, rollup.free_throws_attempted),
+    }
+
+
+def player_season_summary(rollup):
+    """
+    Derive averages, shooting percentages and per-minute rates from a `PlayerSeasonRollup`.
+    """
+    return {
+        "athlete_id": rollup.athlete_id,
+        "season": rollup.season,
+        "games": rollup.games,
+        "minutes_per_game": _ratio(rollup.minutes, rollup.games),
+        "points_per_game": _ratio(rollup.points, rollup.games),
+        "rebounds_per_game": _ratio(rollup.rebounds, rollup.games),
+        "assists_per_game": _ratio(rollup.assists, rollup.games),
+        "points_per_minute": _ratio(rollup.points, rollup.minutes),
+        "rebounds_per_minute": _ratio(rollup.rebounds, rollup.minutes),
+        "assists_per_minute": _ratio(rollup.assists, rollup.minutes),
+        **_shooting(rollup),
+    }
+
+
+def team_season_summary(rollup):
+    """
+    Derive record, averages and shooting percentages from a `TeamSeasonRollup`.
+    """
+    return {
+        "team_id": rollup.team_id,
+        "season": rollup.season,
+        "games": rollup.games,
+        "wins": rollup.wins,
+        "losses": rollup.games - rollup.wins,
+        "points_per_game": _ratio(rollup.points, rollup.games),
+        "opponent_points_per_game": _ratio(rollup.opponent_points, rollup.games),
+        "rebounds_per_game": _ratio(rollup.rebounds, rollup.games),
+        "assists_per_game": _ratio(rollup.assists, rollup.games),
+        **_shooting(rollup),
+    }
+
+
+def rolling_means(values, window):
+    """
+    Compute trailing-window means over a (games x stats) float array, ignoring NaN cells.
+    Row `i` of the result is the mean of games `i` .. `i + window - 1`.
+    """
+    import numpy as np
+
+    valid = ~np.isnan(values)
+    sums = np.cumsum(np.where(valid, values, 0.0), axis=0)
+    counts = np.cumsum(valid, axis=0)
+    sums = np.vstack([np.zeros((1, values.shape[1])), sums])
+    counts = np.vstack([np.zeros((1, values.shape[1])), counts])
+
+    window_sums = sums[window:] - sums[:-window]
+    window_counts = counts[window:] - counts[:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(window_counts > 0, window_sums / window_counts, np.nan)
+
+
+def rolling_form(rows, stats, window):
+    """
+    Build rolling last-`window`-games averages from rows of (game_id, game_date, *stats)
+    ordered by game date.
+    """
+    import numpy as np
+
+    values = np.array(
+        [[np.nan if value is None else value for value in row[2:]] for row in rows],
+        dtype=float,
+    ).reshape(len(rows), len(stats))
+    means = rolling_means(values, window)
+
+    games = [
+        {
+            "game_id": rows[index + window - 1][0],
+            "game_date": rows[index + window - 1][1],
+            **{stat: None if np.isnan(mean) else round(float(mean), 3) for stat, mean in zip(stats, window_means)},
+        }
+        for index, window_means in enumerate(means)
+    ]
+    return {"window": window, "games": games, "form": games[-1] if games else None}
@@ -0,0 +1,308 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+# Columns of the fake "predictions" tab; the sync keeps A-F, J and K
+SHEET_HEADER = [
+    "game_date", "game_id", "away_team_full_name", "home_team_full_name", "prediction_alternate",
+    "prediction_use", "away_score", "home_score", "total", "book_line", "edge_v4",
+]
+
+
+class FakeSheetHttp:
+    """
+    httplib2-compatible transport that serves a fixed sheet to `values.get` (the whole tab),
+    `values.batchGet` (A1 ranges such as `predictions!A2:F5001`) and the grid row count.
+    """
+
+    def __init__(self, values):
+        self.values = values
+        self.content = json.dumps({"range": "predictions", "majorDimension": "ROWS", "values": values}).encode()
+
+    def _value_range(self, range_name):
+        import re
+
+        first, start, last, end = re.match(r".*!([A-Z])(\d+):([A-Z])(\d+)$", range_name).groups()
+        rows = [
+            row[ord(first) - ord("A"):ord(last) - ord("A") + 1]
+            for row in self.values[int(start) - 1:int(end)]
+        ]
+        return {"range": range_name, "majorDimension": "ROWS", "values": rows}
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        import httplib2
+        from urllib.parse import parse_qs, urlparse
+
+        content = self.content
+        url = urlparse(uri)
+        if url.path.endswith(":batchGet"):
+            ranges = parse_qs(url.query).get("ranges", [])
+            content = json.dumps({"valueRanges": [self._value_range(name) for name in ranges]}).encode()
+        elif "/values/" not in url.path:
+            grid = {"gridProperties": {"rowCount": len(self.values)}}
+            content = json.dumps({"sheets": [{"properties": grid}]}).encode()
+        return httplib2.Response({"status": "200", "content-type": "application/json"}), content
+
+
+def build_sheet_values(num_rows, seed):
+    """
+    Generate a header row plus `num_rows` formatted prediction rows.
+    """
+    rng = np.random.default_rng(seed)
+    start = date(2024, 11, 4)
+    values = [SHEET_HEADER]
+    for index in range(num_rows):
+        book_line = round(float(rng.normal(0.0, 8.0)) * 2) / 2
+        prediction = round(book_line + float(rng.normal(0.0, 3.0)), 2)
+        values.append([
+            (start + timedelta(days=int(index * 150 / max(num_rows, 1)))).strftime("%m/%d/%Y"),
+            str(401700000 + index),
+            f"Away Team {index % 360}",
+            f"Home Team {(index * 7 + 1) % 360}",
+            str(round(prediction + float(rng.normal(0.0, 1.0)), 2)),
+            str(prediction),
+            "", "", "",
+            str(book_line),
+            str(round(prediction - book_line, 2)),
+        ])
+    return values
+
+
+def seed_database(args):
+    """
+    Create the schema and load users, predictions and box scores into the benchmark database.
+    """
+    from sqlalchemy import insert
+
+    from aggregates import refresh_rollups
+    from database import SessionLocal, engine, initialize_database
+    from ingest import upsert_predictions
+    from models import PlayerBoxScore, TeamBoxScore, User
+    from utils import BoxScoreGenerator, load_rows, load_teams
+
+    initialize_database()
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User.__table__),
+            [{"name": f"User {index}", "email": f"user{index}@example.com"} for index in range(args.users)],
+        )
+
+    with SessionLocal() as db:
+        upsert_predictions(db, build_sheet_values(args.predictions, args.seed)[1:])
+
+    generator = BoxScoreGenerator(seed=args.seed)
+    load_teams(engine, generator.teams)
+    game_ids = []
+    for player_rows, team_rows in generator.generate(args.games):
+        load_rows(engine, PlayerBoxScore, player_rows)
+        load_rows(engine, TeamBoxScore, team_rows)
+        game_ids.extend(row["game_id"] for row in team_rows)
+    with SessionLocal() as db:
+        refresh_rollups(db, game_ids)
+
+
+def build_import_body(args, num_games=10):
+    """
+    Generate an NDJSON upload of player box scores, with team names, for games after the seeded ones.
+    """
+    from utils import BoxScoreGenerator
+
+    generator = BoxScoreGenerator(seed=args.seed + 1, first_game_id=args.games + 1)
+    team_names = {team["team_id"]: team["team_name"] for team in generator.teams}
+    lines = [
+        json.dumps({**row, "team_name": team_names.get(row["team_id"])}, default=str)
+        for player_rows, _ in generator.generate(num_games)
+        for row in player_rows
+    ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def endpoint_requests(args):
+    """
+    Return the benchmarked endpoints as name -> function building the i-th request as
+    `(method, url, params)`, optionally followed by extra `httpx` request arguments such as a body.
+    """
+    num_users = max(args.users, 1)
+    num_games = max(args.games, 1)
+    import_body = build_import_body(args)
+    return {
+        "GET /": lambda i: ("GET", "/", {"limit": 50}),
+        "GET /users/{user_id}": lambda i: ("GET", f"/users/{i % num_users + 1}", None),
+        "GET /users/me": lambda i: ("GET", "/users/me", None),
+        "POST /add_user/": lambda i: ("POST", "/add_user/", {"name": f"Bench {i}", "email": f"bench-{i}-{time.time_ns()}@example.com"}),
+        "POST /users/bulk": lambda i: ("POST", "/users/bulk", None, {"json": [
+            {"name": f"Bulk {i}-{j}", "email": f"bulk-{i}-{j}-{time.time_ns()}@example.com"} for j in range(50)
+        ]}),
+        "GET /cbbpredictions/": lambda i: ("GET", "/cbbpredictions/", {"lowest_book_line": -5, "highest_book_line": 5}),
+        "GET /cbbpredictions/?format=ndjson": lambda i: ("GET", "/cbbpredictions/", {"format": "ndjson"}),
+        "GET /cbbpredictions/search": lambda i: ("GET", "/cbbpredictions/search", {"q": f"home team {i % 360}"}),
+        "POST /cbbpredictions/fetch-and-save/": lambda i: ("POST", "/cbbpredictions/fetch-and-save/", None),
+        "GET /export/player_box_score": lambda i: ("GET", "/export/player_box_score", {"columns": "game_id,athlete_id,points"}),
+        "GET /aggregates/players/{athlete_id}": lambda i: ("GET", f"/aggregates/players/{1000 + i % 4680}", None),
+        "GET /aggregates/players/{athlete_id}/rolling": lambda i: ("GET", f"/aggregates/players/{1000 + i % 4680}/rolling", {"window": 5}),
+        "GET /aggregates/teams/{team_id}": lambda i: ("GET", f"/aggregates/teams/{i % 360 + 1}", None),
+        "POST /aggregates/refresh": lambda i: ("POST", "/aggregates/refresh", None, {"json": [
+            (i * 10 + j) % num_games + 1 for j in range(10)
+        ]}),
+        "POST /import/player_box_score": lambda i: ("POST", "/import/player_box_score", None, {
+            "content": import_body, "headers": {"content-type": "application/x-ndjson"},
+        }),
+    }
+
+
+async def wait_for_job(client, job_id, interval=0.05):
+    """
+    Poll a background job until it finishes, so its run time and queries count towards
+    the request that started it.
+    """
+    while True:
+        response = await client.get(f"/cbbpredictions/jobs/{job_id}")
+        if response.status_code >= 400 or response.json()["status"] not in ("queued", "running"):
+            return response
+        await asyncio.sleep(interval)
+
+
+async def run_endpoint(client, build_request, requests, concurrency, query_counter):
+    """
+    Fire `requests` requests at one endpoint from `concurrency` workers and collect timings.
+    A 202 response queued a background job; the request ends when that job has finished.
+    """
+    latencies = []
+    errors = 0
+    next_index = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for index in next_index:
+            method, url, params, *extra = build_request(index)
+            started = time.perf_counter()
+            response = await client.request(method, url, params=params, **(extra[0] if extra else {}))
+            await response.aread()
+            if response.status_code == 202:
+                response = await wait_for_job(client, response.json()["job_id"])
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    queries_before = query_counter["count"]
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    queries = query_counter["count"] - queries_before
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies_ms, 50)), 3),
+            "p95": round(float(np.percentile(latencies_ms, 95)), 3),
+            "p99": round(float(np.percentile(latencies_ms, 99)), 3),
+            "max": round(float(latencies_ms.max()), 3),
+        },
+        "queries_per_request": round(queries / requests, 2),
+    }
+
+
+async def run_benchmark(args):
+    import httpx
+    from sqlalchemy import event
+
+    from database import all_engines
+    from main import app
+    from sheets import SheetsClient, set_sheets_client
+
+    set_sheets_client(SheetsClient(http=FakeSheetHttp(build_sheet_values(args.predictions, args.seed))))
+
+    query_counter = {"count": 0}
+
+    def count_query(*_):
+        query_counter["count"] += 1
+
+    for engine in all_engines().values():
+        event.listen(engine, "before_cursor_execute", count_query)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, build_request in endpoint_requests(args).items():
+            if args.endpoints and not any(selected in name for selected in args.endpoints):
+                continue
+            # Warm up connections and caches before measuring
+            await run_endpoint(client, build_request, min(args.concurrency, args.requests), 1, query_counter)
+            results[name] = await run_endpoint(client, build_request, args.requests, args.concurrency, query_counter)
+            print(f"{name:45s} {results[name]['throughput_rps']:>10.1f} req/s  "
+                  f"p50 {results[name]['latency_ms']['p50']:>8.2f} ms  "
+                  f"p99 {results[name]['latency_ms']['p99']:>8.2f} ms  "
+                  f"{results[name]['queries_per_request']:>6.2f} q/req")
+    return results
+
+
+def git_revision():
+    try:
+        # Resolve the revision of this checkout, whatever directory the benchmark runs from
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every API route against a seeded local database.")
+    parser.add_argument("--database", default="benchmark.db", help="SQLite file to seed and serve from")
+    parser.add_argument("--users", type=int, default=10000, help="Users to seed")
+    parser.add_argument("--predictions", type=int, default=5000, help="Prediction sheet rows to seed and serve")
+    parser.add_argument("--games", type=int, default=2000, help="Games of box scores to seed")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for generated data")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight requests")
+    parser.add_argument("--endpoints", nargs="*", help="Only run endpoints whose name contains one of these")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--reuse", action="store_true", help="Reuse an existing, already seeded database")
+    args = parser.parse_args()
+
+    # Point the app at the benchmark database before anything imports database.py
+    database_path = os.path.abspath(args.database)
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{database_path}"
+    if not args.reuse:
+        if os.path.exists(database_path):
+            os.remove(database_path)
+        seed_database(args)
+
+    results = asyncio.run(run_benchmark(args))
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": {
+            "users": args.users,
+            "predictions": args.predictions,
+            "games": args.games,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+import orjson
+from fastapi import Response
+from sqlalchemy import select, update
+
+from config import CACHE_CONTROL, DATA_VERSION_TTL_SECONDS
+from database import build_insert_ignore
+from models import DataVersion
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with orjson, which serializes dates and floats natively.
+    Returning it directly from an endpoint also skips FastAPI's `jsonable_encoder` pass.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content):
+        return orjson.dumps(content)
+
+
+def bump_data_version(db, table_name):
+    """
+    Increment the data version of `table_name` inside the caller's transaction.
+    Every write path of a cached table must call this before committing.
+    """
+    table = DataVersion.__table__
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db.execute(build_insert_ignore(db.get_bind().dialect.name, table, [{"table_name": table_name, "version": 0}]))
+    db.execute(
+        update(table)
+        .where(table.c.table_name == table_name)
+        .values(version=table.c.version + 1, updated_at=now)
+    )
+    data_versions.invalidate(table_name)
+
+
+class DataVersionCache:
+    """
+    Per-worker cache of table data versions, re-read from the database at most once
+    every `ttl` seconds per table so repeated polls need no other query.
+    """
+
+    def __init__(self, ttl=DATA_VERSION_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries = {}
+
+    async def get(self, db, table_name):
+        """
+        Return `(version, updated_at)` of `table_name`; `(0, None)` before its first write.
+        - `db`: The request's asyncio session; only queried when the cached entry has expired.
+        """
+        entry = self._entries.get(table_name)
+        now = time.monotonic()
+        if entry is not None and now - entry[2] < self.ttl:
+            return entry[0], entry[1]
+
+        row = (
+            await db.execute(
+                select(DataVersion.version, DataVersion.updated_at).where(DataVersion.table_name == table_name)
+            )
+        ).first()
+        version, updated_at = row if row is not None else (0, None)
+        self._entries[table_name] = (version, updated_at, now)
+        return version, updated_at
+
+    def invalidate(self, table_name):
+        self._entries.pop(table_name, None)
+
+
+data_versions = DataVersionCache()
+
+
+def cache_headers(table_name, version, updated_at, variant=None):
+    """
+    Build the validator and Cache-Control headers for a response derived from `table_name`.
+    - `variant`: Distinguishes representations of the same URL, e.g. the response format.
+    """
+    tag = f"{table_name}-{version}" if variant is None else f"{table_name}-{version}-{variant}"
+    # Weak, because compression changes the bytes but not the content
+    headers = {"ETag": f'W/"{tag}"', "Cache-Control": CACHE_CONTROL}
+    if updated_at is not None:
+        headers["Last-Modified"] = format_datetime(updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def _etag_matches(if_none_match, etag):
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def not_modified(request, headers):
+    """
+    Return a 304 response when the request's `If-None-Match` (or, without it,
+    `If-Modified-Since`) shows the client already has the current data; otherwise None.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, headers["ETag"])
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or "Last-Modified" not in headers:
+            return None
+        try:
+            fresh = parsedate_to_datetime(headers["Last-Modified"]) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+    return Response(status_code=304, headers=headers) if fresh else None
@@ -1,9 +1,64 @@
 # config.py
+import os
 
-DB_HOST = "database-1.cfack6m8c2y8.us-east-1.rds.amazonaws.com"
-DB_PORT = 3306
-DB_USER = "admin"
-DB_PASSWORD = "password"
-DB_NAME = "basketball"
 
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
\ No newline at end of file
+def _flag(name, default):
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+# Every setting can be overridden from the environment, e.g. to point at a local SQLite file
+DB_HOST = os.getenv("DB_HOST", "database-1.cfack6m8c2y8.us-east-1.rds.amazonaws.com")
+DB_PORT = int(os.getenv("DB_PORT", "3306"))
+DB_USER = os.getenv("DB_USER", "admin")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
+DB_NAME = os.getenv("DB_NAME", "basketball")
+
+DATABASE_URL = os.getenv(
+    "DATABASE_URL", f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+# Connection pool settings (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds; keep below the server/proxy idle timeout
+DB_POOL_PRE_PING = _flag("DB_POOL_PRE_PING", "true")
+
+# Comma-separated asyncio URLs of read replicas used by read-only endpoints
+READ_REPLICA_URLS = [url.strip() for url in os.getenv("READ_REPLICA_URLS", "").split(",") if url.strip()]
+
+# Create missing tables when a worker starts (otherwise run `python manage.py create-schema`)
+CREATE_SCHEMA_ON_STARTUP = _flag("CREATE_SCHEMA_ON_STARTUP", "false")
+
+# Log every SQL statement (slow; for local debugging only)
+SQL_ECHO = _flag("SQL_ECHO", "false")
+
+# Request/SQL instrumentation and the Prometheus /metrics endpoint
+METRICS_ENABLED = _flag("METRICS_ENABLED", "true")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+
+# Run the Google Sheets prediction sync every N seconds in the background (0 disables it)
+SYNC_INTERVAL_SECONDS = float(os.getenv("SYNC_INTERVAL_SECONDS", "0"))
+
+# An active background job whose status has not changed for this many seconds is treated as
+# abandoned (e.g. its worker was killed), so another worker may start a new one
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "900"))
+
+# How the sync reads the predictions sheet: "projected" fetches only the needed columns,
+# typed and in row chunks; "full" fetches the whole tab as formatted strings
+SHEETS_FETCH_MODE = os.getenv("SHEETS_FETCH_MODE", "projected").strip().lower()
+SHEETS_CHUNK_ROWS = int(os.getenv("SHEETS_CHUNK_ROWS", "5000"))
+
+# Serve /cbbpredictions/ JSON pages from an in-process snapshot rebuilt after each sync
+PREDICTION_INDEX_ENABLED = _flag("PREDICTION_INDEX_ENABLED", "false")
+
+# HTTP caching of read endpoints: Cache-Control sent with ETag/Last-Modified responses, and
+# how long a worker trusts its cached per-table data versions before re-reading them
+CACHE_CONTROL = os.getenv("CACHE_CONTROL", "no-cache")
+DATA_VERSION_TTL_SECONDS = float(os.getenv("DATA_VERSION_TTL_SECONDS", "1"))
+
+# Responses at least this large (bytes) are gzip-compressed for clients that accept it
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
@@ -1,10 +1,199 @@
-CREATE TABLE `cbb_predictions` (
-  `game_date` DATE,
-  `game_id` DOUBLE DEFAULT NULL,
-  `away_team_full_name` VARCHAR(255),
-  `home_team_full_name` VARCHAR(255),
-  `prediction_alternate` DOUBLE DEFAULT NULL,
-  `prediction_use` DOUBLE DEFAULT NULL,
-  `book_line` DOUBLE DEFAULT NULL,
-  `edge_v4` DOUBLE DEFAULT NULL
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+-- Generated from models.py by `python manage.py dump-schema`; do not edit by hand.
+
+CREATE TABLE background_jobs (
+  id VARCHAR(32) NOT NULL,
+  kind VARCHAR(64) NOT NULL,
+  active_kind VARCHAR(64),
+  status VARCHAR(16) NOT NULL,
+  stage VARCHAR(32),
+  progress FLOAT NOT NULL,
+  counts JSON,
+  error TEXT,
+  created_at DATETIME NOT NULL,
+  started_at DATETIME,
+  finished_at DATETIME,
+  updated_at DATETIME NOT NULL,
+  PRIMARY KEY (id),
+  UNIQUE (active_kind)
+);
+
+CREATE INDEX ix_background_jobs_kind_created_at ON background_jobs (kind, created_at);
+
+CREATE TABLE cbb_predictions (
+  no INTEGER NOT NULL AUTO_INCREMENT,
+  game_date DATE,
+  game_id VARCHAR(50),
+  away_team_full_name VARCHAR(50),
+  home_team_full_name VARCHAR(50),
+  prediction_alternate FLOAT,
+  prediction_use FLOAT,
+  book_line FLOAT,
+  edge_v4 FLOAT,
+  row_hash VARCHAR(64),
+  PRIMARY KEY (no)
+);
+
+CREATE INDEX ix_cbb_predictions_game_date_book_line ON cbb_predictions (game_date, book_line);
+
+CREATE UNIQUE INDEX ix_cbb_predictions_game_id ON cbb_predictions (game_id);
+
+CREATE TABLE data_versions (
+  table_name VARCHAR(64) NOT NULL,
+  version INTEGER NOT NULL,
+  updated_at DATETIME,
+  PRIMARY KEY (table_name)
+);
+
+CREATE TABLE player_box_score (
+  game_id INTEGER NOT NULL,
+  athlete_id INTEGER NOT NULL,
+  season INTEGER,
+  season_type INTEGER,
+  game_date DATE,
+  game_date_time DATETIME,
+  athlete_display_name VARCHAR(255),
+  team_id INTEGER,
+  minutes FLOAT,
+  field_goals_made INTEGER,
+  field_goals_attempted INTEGER,
+  three_point_field_goals_made INTEGER,
+  three_point_field_goals_attempted INTEGER,
+  free_throws_made INTEGER,
+  free_throws_attempted INTEGER,
+  offensive_rebounds INTEGER,
+  defensive_rebounds INTEGER,
+  rebounds INTEGER,
+  assists INTEGER,
+  steals INTEGER,
+  blocks INTEGER,
+  turnovers INTEGER,
+  fouls INTEGER,
+  points INTEGER,
+  starter VARCHAR(255),
+  ejected VARCHAR(255),
+  did_not_play VARCHAR(255),
+  active VARCHAR(255),
+  athlete_jersey INTEGER,
+  athlete_short_name VARCHAR(255),
+  athlete_headshot_href VARCHAR(255),
+  athlete_position_name VARCHAR(255),
+  athlete_position_abbreviation VARCHAR(255),
+  home_away VARCHAR(255),
+  team_winner VARCHAR(255),
+  team_score INTEGER,
+  opponent_team_id INTEGER,
+  opponent_team_score INTEGER,
+  PRIMARY KEY (game_id, athlete_id)
+);
+
+CREATE INDEX ix_player_box_score_athlete_id_season ON player_box_score (athlete_id, season);
+
+CREATE TABLE player_season_rollup (
+  athlete_id INTEGER NOT NULL,
+  season INTEGER NOT NULL,
+  games INTEGER NOT NULL,
+  minutes FLOAT NOT NULL,
+  points INTEGER NOT NULL,
+  rebounds INTEGER NOT NULL,
+  assists INTEGER NOT NULL,
+  steals INTEGER NOT NULL,
+  blocks INTEGER NOT NULL,
+  turnovers INTEGER NOT NULL,
+  field_goals_made INTEGER NOT NULL,
+  field_goals_attempted INTEGER NOT NULL,
+  three_point_field_goals_made INTEGER NOT NULL,
+  three_point_field_goals_attempted INTEGER NOT NULL,
+  free_throws_made INTEGER NOT NULL,
+  free_throws_attempted INTEGER NOT NULL,
+  PRIMARY KEY (athlete_id, season)
+);
+
+CREATE TABLE team_box_score (
+  game_id INTEGER NOT NULL AUTO_INCREMENT,
+  season INTEGER,
+  season_type INTEGER,
+  game_date DATE,
+  game_date_time DATETIME,
+  team_id INTEGER NOT NULL,
+  team_home_away VARCHAR(255),
+  team_score INTEGER,
+  team_winner VARCHAR(255),
+  assists INTEGER,
+  blocks INTEGER,
+  defensive_rebounds INTEGER,
+  fast_break_points INTEGER,
+  field_goal_pct FLOAT,
+  field_goals_made INTEGER,
+  field_goals_attempted INTEGER,
+  flagrant_fouls INTEGER,
+  fouls INTEGER,
+  free_throw_pct FLOAT,
+  free_throws_made INTEGER,
+  free_throws_attempted INTEGER,
+  largest_lead INTEGER,
+  offensive_rebounds INTEGER,
+  points_in_paint INTEGER,
+  steals INTEGER,
+  team_turnovers INTEGER,
+  technical_fouls INTEGER,
+  three_point_field_goal_pct FLOAT,
+  three_point_field_goals_made INTEGER,
+  three_point_field_goals_attempted INTEGER,
+  total_rebounds INTEGER,
+  total_technical_fouls INTEGER,
+  total_turnovers INTEGER,
+  turnover_points INTEGER,
+  turnovers INTEGER,
+  opponent_team_id INTEGER,
+  opponent_team_score INTEGER,
+  PRIMARY KEY (game_id)
+);
+
+CREATE INDEX ix_team_box_score_team_id_season ON team_box_score (team_id, season);
+
+CREATE TABLE team_season_rollup (
+  team_id INTEGER NOT NULL,
+  season INTEGER NOT NULL,
+  games INTEGER NOT NULL,
+  wins INTEGER NOT NULL,
+  points INTEGER NOT NULL,
+  opponent_points INTEGER NOT NULL,
+  rebounds INTEGER NOT NULL,
+  assists INTEGER NOT NULL,
+  steals INTEGER NOT NULL,
+  blocks INTEGER NOT NULL,
+  turnovers INTEGER NOT NULL,
+  field_goals_made INTEGER NOT NULL,
+  field_goals_attempted INTEGER NOT NULL,
+  three_point_field_goals_made INTEGER NOT NULL,
+  three_point_field_goals_attempted INTEGER NOT NULL,
+  free_throws_made INTEGER NOT NULL,
+  free_throws_attempted INTEGER NOT NULL,
+  PRIMARY KEY (team_id, season)
+);
+
+CREATE TABLE teams (
+  team_id INTEGER NOT NULL AUTO_INCREMENT,
+  team_uid VARCHAR(255),
+  team_slug VARCHAR(255),
+  team_location VARCHAR(255),
+  team_name VARCHAR(255),
+  team_abbreviation VARCHAR(255),
+  team_display_name VARCHAR(255),
+  team_short_display_name VARCHAR(255),
+  team_color VARCHAR(255),
+  team_alternate_color VARCHAR(255),
+  team_logo VARCHAR(255),
+  PRIMARY KEY (team_id)
+);
+
+CREATE TABLE users (
+  id INTEGER NOT NULL AUTO_INCREMENT,
+  name VARCHAR(50) NOT NULL,
+  email VARCHAR(50),
+  PRIMARY KEY (id)
+);
+
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+
+CREATE INDEX ix_users_id ON users (id);
@@ -1,14 +1,57 @@
-from sqlalchemy import create_engine
+import itertools
+from contextlib import contextmanager
+
+from fastapi import Depends
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
+from config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    READ_REPLICA_URLS,
+    SQL_ECHO,
+)
+
+
+def _engine_options(url):
+    """
+    Build engine keyword arguments with the configured pool settings for `url`.
+    """
+    options = {"echo": SQL_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    if make_url(url).get_backend_name() != "sqlite":  # SQLite pools take no sizing options
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return options
+
 
 # Create a SQLAlchemy engine
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
 
 # Create a session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Dependency to get the database session
+# Create an asyncio engine and session factory for the API handlers (primary, used for writes)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Read replicas, handed out round-robin to read-only endpoints
+replica_engines = [create_async_engine(url, **_engine_options(url)) for url in READ_REPLICA_URLS]
+ReplicaSessionLocals = [
+    async_sessionmaker(replica, autoflush=False, expire_on_commit=False) for replica in replica_engines
+]
+_replica_cycle = itertools.cycle(ReplicaSessionLocals)
+
+# Dependency to get the database session (sync fallback for scripts and thread pools)
 def get_db():
     db = SessionLocal()
     try:
@@ -16,6 +59,38 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get an asyncio database session on the primary
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def read_session_factory():
+    """
+    Return the next read-replica session factory, or the primary's when no replicas are configured.
+    """
+    if not ReplicaSessionLocals:
+        return AsyncSessionLocal
+    return next(_replica_cycle)
+
+# Dependency picking one read session factory per request, so the request's session and
+# any session it opens later (e.g. for streaming) use the same replica
+def get_read_session_factory():
+    return read_session_factory()
+
+# Dependency to get an asyncio database session for read-only endpoints
+async def get_async_read_db(session_factory=Depends(get_read_session_factory)):
+    async with session_factory() as db:
+        yield db
+
+def all_engines():
+    """
+    Return every synchronous engine (including those behind asyncio engines) by label.
+    """
+    engines = {"primary": engine, "primary_async": async_engine.sync_engine}
+    for index, replica in enumerate(replica_engines):
+        engines[f"replica_{index}"] = replica.sync_engine
+    return engines
+
 # Ensure tables are created if they don't exist
 def initialize_database():
     """
@@ -23,4 +98,75 @@ def initialize_database():
     if they don't already exist.
     """
     from models import Base  # Import Base from models to register all models
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+
+
+@contextmanager
+def advisory_lock(name, bind=None):
+    """
+    Hold a server-wide named lock on MySQL so a job runs in at most one worker process.
+    Raises RuntimeError when another connection holds the lock. Other dialects rely on
+    the single active job per kind in `background_jobs` and skip the lock.
+    """
+    bind = bind or engine
+    if bind.dialect.name != "mysql":
+        yield
+        return
+
+    # A dedicated connection keeps the lock independent of the job's own transactions
+    with bind.connect() as connection:
+        if connection.scalar(text("SELECT GET_LOCK(:name, 0)"), {"name": name}) != 1:
+            raise RuntimeError(f"Another '{name}' job is already running")
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+
+
+def build_upsert(dialect_name, table, rows, key_columns, update_columns=None):
+    """
+    Build a single multi-row INSERT for `rows` that updates the existing record
+    when a row with the same `key_columns` is already stored.
+    - `dialect_name`: Name of the SQLAlchemy dialect (`mysql`, `sqlite`, `postgresql`).
+    - `rows`: Row dicts to embed, or None for a statement to execute with a list of parameter
+      dicts (executemany), which avoids compiling one bind parameter per value for wide tables.
+    - `update_columns`: Columns to overwrite on conflict (default: every non-key column in `rows`).
+    """
+    if update_columns is None:
+        update_columns = [name for name in rows[0] if name not in key_columns]
+
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table) if rows is None else insert(table).values(rows)
+        return stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in update_columns})
+
+    if dialect_name in ("sqlite", "postgresql"):
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table) if rows is None else insert(table).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={name: stmt.excluded[name] for name in update_columns},
+        )
+
+    raise ValueError(f"Upserts are not supported for the '{dialect_name}' dialect")
+
+
+def build_insert_ignore(dialect_name, table, rows):
+    """
+    Build a single multi-row INSERT for `rows` that skips rows violating a unique constraint.
+    """
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        return insert(table).values(rows).prefix_with("IGNORE")
+
+    if dialect_name in ("sqlite", "postgresql"):
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        return insert(table).values(rows).on_conflict_do_nothing()
+
+    raise ValueError(f"Conflict-skipping inserts are not supported for the '{dialect_name}' dialect")
@@ -0,0 +1,165 @@
+from fastapi import HTTPException
+from sqlalchemy import Date, DateTime, Float, Integer, select
+
+from models import TEAM_ID_PREFIXES, PlayerBoxScore, Team, TeamBoxScore
+
+# Tables exposed through the columnar export endpoint
+EXPORT_MODELS = {
+    "player_box_score": PlayerBoxScore,
+    "team_box_score": TeamBoxScore,
+    "teams": Team,
+}
+
+EXPORT_MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Rows pulled from the DB cursor per record batch (and per Parquet row group)
+EXPORT_CHUNK_SIZE = 10000
+
+
+def _arrow_type(column):
+    """
+    Map a SQLAlchemy column type to the Arrow type used in exports.
+    """
+    import pyarrow as pa
+
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _team_columns(table):
+    """
+    Return the `teams` attributes of a box-score table's team and opponent, labelled with
+    their prefixed names (`team_name`, `opponent_team_logo`, ...), and the outer joins
+    that provide them.
+    """
+    columns = {}
+    joins = []
+    for id_column, prefix in TEAM_ID_PREFIXES.items():
+        if id_column not in table.c:
+            continue
+        teams = Team.__table__.alias(f"{prefix}teams")
+        joins.append((teams, teams.c.team_id == table.c[id_column]))
+        for column in teams.c:
+            if column.name != "team_id":
+                name = prefix + column.name.removeprefix("team_")
+                columns[name] = column.label(name)
+    return columns, joins
+
+
+def build_export_query(model, columns=None, season=None, team_id=None, start_date=None, end_date=None,
+                       include_teams=False):
+    """
+    Build the projected, filtered select for an export together with its Arrow schema.
+    - `columns`: Column names to include (default: every column of the table).
+    - `season`, `team_id`: Exact-match filters.
+    - `start_date`, `end_date`: Inclusive bounds on `game_date`.
+    - `include_teams`: Join the team and opponent attributes from `teams` onto box scores.
+    Raises a 400 error for unknown column names or filters the table does not support.
+    """
+    import pyarrow as pa
+
+    table = model.__table__
+    team_columns, joins = _team_columns(table) if include_teams else ({}, [])
+    available = {column.name: column for column in table.c}
+    available.update(team_columns)
+    if columns:
+        unknown = [name for name in columns if name not in available]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+        selected = [available[name] for name in columns]
+    else:
+        selected = list(available.values())
+
+    filters = {"season": season, "team_id": team_id, "game_date": start_date or end_date}
+    unsupported = [name for name, value in filters.items() if value is not None and name not in table.c]
+    if unsupported:
+        raise HTTPException(status_code=400, detail=f"Cannot filter on: {', '.join(unsupported)}")
+
+    source = table
+    for teams, condition in joins:
+        source = source.outerjoin(teams, condition)
+    query = select(*selected).select_from(source)
+    if season is not None:
+        query = query.where(table.c.season == season)
+    if team_id is not None:
+        query = query.where(table.c.team_id == team_id)
+    if start_date:
+        query = query.where(table.c.game_date >= start_date)
+    if end_date:
+        query = query.where(table.c.game_date <= end_date)
+    query = query.order_by(*table.primary_key.columns)
+
+    schema = pa.schema([pa.field(column.name, _arrow_type(column)) for column in selected])
+    return query, schema
+
+
+class _ChunkSink:
+    """
+    Write-only file object that buffers what Arrow writes until it is drained.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def stream_export(session_factory, query, schema, format, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream the rows of `query` as an Arrow IPC stream or a Parquet file, building one
+    record batch per `chunk_size` rows fetched from a server-side cursor.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    if format == "parquet":
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    async with session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions():
+            columns = list(zip(*rows))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            )
+            if format == "parquet":
+                writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
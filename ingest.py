@@ -0,0 +1,164 @@
+import hashlib
+import json
+from datetime import date, timedelta
+
+from dateutil import parser as date_parser
+from sqlalchemy import delete, select
+
+from caching import bump_data_version
+from database import build_upsert
+from models import CbbPredictions
+
+# Day zero of Google Sheets serial dates
+SHEETS_EPOCH = date(1899, 12, 30)
+
+# Number of new or changed sheet rows written per multi-row INSERT statement and commit
+BATCH_SIZE = 500
+
+
+def _parse_float(value):
+    """
+    Convert a sheet cell to a float, treating empty cells as missing.
+    """
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _parse_date(value):
+    """
+    Convert a sheet cell to a date, treating empty cells as missing.
+    Numeric cells are spreadsheet serial day numbers (unformatted values).
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return SHEETS_EPOCH + timedelta(days=int(value))
+    return date_parser.parse(str(value)).date()
+
+
+def _parse_game_id(value):
+    """
+    Convert a sheet cell to a game_id string; unformatted numeric ids arrive as numbers.
+    """
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def sheet_game_id(row):
+    """
+    Return the game_id of a filtered sheet row, or None when it has none.
+    """
+    if len(row) < 2:
+        return None
+    return _parse_game_id(row[1]) or None
+
+
+def parse_prediction_row(row):
+    """
+    Convert a filtered sheet row into column values for `CbbPredictions`.
+    Returns None when the row is too short, has no game_id or holds unparsable values.
+    """
+    if len(row) < 8:  # Ensure row has enough columns
+        return None
+    game_id = sheet_game_id(row)
+    if not game_id:
+        return None
+    try:
+        return {
+            "game_date": _parse_date(row[0]),
+            "game_id": game_id,
+            "away_team_full_name": row[2],
+            "home_team_full_name": row[3],
+            "prediction_alternate": _parse_float(row[4]),
+            "prediction_use": _parse_float(row[5]),
+            "book_line": _parse_float(row[6]),
+            "edge_v4": _parse_float(row[7]),
+        }
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def fingerprint_prediction(values):
+    """
+    Compute a stable content fingerprint for parsed prediction values.
+    """
+    payload = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _write_predictions(db, rows):
+    """
+    Upsert one batch of parsed predictions and commit it with a data-version bump.
+    """
+    db.execute(build_upsert(db.get_bind().dialect.name, CbbPredictions.__table__, rows, ["game_id"]))
+    bump_data_version(db, CbbPredictions.__tablename__)
+    db.commit()
+
+
+def upsert_predictions(db, rows, batch_size=BATCH_SIZE, delete_missing=False, force=False, progress=None):
+    """
+    Sync prediction rows keyed on `game_id`, writing only rows that are new or changed.
+    Rows are compared and written as `rows` yields them, one committed batch at a time, so
+    a sync holds the stored fingerprints and the sheet's game_ids but not the sheet itself.
+    - `rows`: Iterable of filtered sheet rows without the header row, consumed once.
+    - `batch_size`: Number of new or changed rows written per statement and transaction.
+    - `delete_missing`: Delete stored predictions whose game_id is no longer in the sheet;
+      rows that are still there but fail to parse keep their stored prediction.
+    - `force`: Rewrite every row even when its fingerprint is unchanged.
+    - `progress`: Optional callback receiving (rows read, total rows or None when `rows`
+      has no length) after each written batch.
+    Returns the number of inserted, updated, unchanged, skipped and deleted rows.
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0, "deleted": 0}
+    total = len(rows) if hasattr(rows, "__len__") else None
+
+    # A single scan of (game_id, row_hash) tells new, changed and unchanged rows apart
+    stored = dict(db.execute(select(CbbPredictions.game_id, CbbPredictions.row_hash)).all())
+    db.commit()
+
+    seen = set()  # Every game_id on the sheet, including rows that fail to parse
+    synced = set()  # game_ids taken from an earlier row; later duplicates are skipped
+    pending = []
+    read = 0
+    for row in rows:
+        read += 1
+        game_id = sheet_game_id(row)
+        if game_id:
+            seen.add(game_id)
+        values = parse_prediction_row(row)
+        if values is None or values["game_id"] in synced:
+            counts["skipped"] += 1
+            continue
+        synced.add(values["game_id"])
+        values["row_hash"] = fingerprint_prediction(values)
+
+        if values["game_id"] not in stored:
+            counts["inserted"] += 1
+        elif force or stored[values["game_id"]] != values["row_hash"]:
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+            continue
+        pending.append(values)
+        if len(pending) >= batch_size:
+            _write_predictions(db, pending)
+            pending = []
+            if progress is not None:
+                progress(read, total)
+    if pending:
+        _write_predictions(db, pending)
+    if progress is not None:
+        progress(read, total)
+
+    if delete_missing:
+        removed = [game_id for game_id in stored if game_id is not None and game_id not in seen]
+        for start in range(0, len(removed), batch_size):
+            batch = removed[start:start + batch_size]
+            db.execute(delete(CbbPredictions).where(CbbPredictions.game_id.in_(batch)))
+        if removed:
+            bump_data_version(db, CbbPredictions.__tablename__)
+            db.commit()
+        counts["deleted"] = len(removed)
+    return counts
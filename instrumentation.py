@@ -0,0 +1,235 @@
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+
+from fastapi import Response
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Query count and time of the request being served, shared with SQLAlchemy event hooks
+_request_stats = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """
+    Cumulative Prometheus-style histogram.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    Process-wide store for request and SQL metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_latency = {}
+        self.request_queries = {}
+        self.request_query_time = {}
+        self.query_latency = Histogram(LATENCY_BUCKETS)
+        self.slow_queries = 0
+        self.engines = {}
+        self.startup = None
+
+    def observe_request(self, method, route, status, seconds, queries, query_seconds):
+        with self._lock:
+            key = (method, route, str(status))
+            self.request_latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.request_queries.setdefault((method, route), Histogram(QUERY_COUNT_BUCKETS)).observe(queries)
+            self.request_query_time.setdefault((method, route), Histogram(LATENCY_BUCKETS)).observe(query_seconds)
+
+    def observe_query(self, seconds, slow):
+        with self._lock:
+            self.query_latency.observe(seconds)
+            if slow:
+                self.slow_queries += 1
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            _render_histograms(
+                lines, "http_request_duration_seconds", "Request latency by route.",
+                ("method", "route", "status"), self.request_latency,
+            )
+            _render_histograms(
+                lines, "http_request_db_queries", "SQL statements executed per request by route.",
+                ("method", "route"), self.request_queries,
+            )
+            _render_histograms(
+                lines, "http_request_db_seconds", "Time spent in SQL statements per request by route.",
+                ("method", "route"), self.request_query_time,
+            )
+            _render_histograms(
+                lines, "db_query_duration_seconds", "SQL statement latency.", (), {(): self.query_latency},
+            )
+            lines.append("# HELP db_slow_queries_total SQL statements slower than the slow-query threshold.")
+            lines.append("# TYPE db_slow_queries_total counter")
+            lines.append(f"db_slow_queries_total {self.slow_queries}")
+
+        if self.startup is not None:
+            for name, help_text, value in (
+                ("app_import_seconds", "Time spent importing the application module.",
+                 self.startup["import_seconds"]),
+                ("app_startup_seconds", "Time from the start of imports until the worker was ready.",
+                 self.startup["startup_seconds"]),
+                ("app_ready_timestamp_seconds", "Unix time at which the worker became ready.",
+                 datetime.fromisoformat(self.startup["ready_at"]).timestamp()),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+
+        for name, help_text, method in (
+            ("db_pool_size", "Configured connection pool size.", "size"),
+            ("db_pool_checked_out", "Connections currently checked out of the pool.", "checkedout"),
+            ("db_pool_checked_in", "Idle connections held by the pool.", "checkedin"),
+            ("db_pool_overflow", "Connections opened beyond the pool size.", "overflow"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for engine_name, engine in self.engines.items():
+                # Only queue-based pools report these statistics
+                stat = getattr(engine.pool, method, None)
+                if stat is not None:
+                    lines.append(f'{name}{{engine="{_escape(engine_name)}"}} {stat()}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histograms(lines, name, help_text, label_names, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for label_values, histogram in sorted(histograms.items()):
+        labels = ",".join(f'{label}="{_escape(value)}"' for label, value in zip(label_names, label_values))
+        prefix = labels + "," if labels else ""
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {histogram.sum}")
+        lines.append(f"{name}_count{suffix} {histogram.count}")
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency and SQL statement counts per route template.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = {"queries": 0, "query_seconds": 0.0}
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope, which keeps label cardinality low
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            metrics.observe_request(
+                scope["method"], route_path, status_code, time.perf_counter() - started,
+                stats["queries"], stats["query_seconds"],
+            )
+            _request_stats.reset(token)
+
+
+def instrument_engine(engine, name, slow_query_ms):
+    """
+    Attach query counting, timing and slow-query logging hooks to a synchronous engine.
+    """
+    metrics.engines[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        slow = elapsed * 1000 >= slow_query_ms
+        metrics.observe_query(elapsed, slow)
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats["queries"] += 1
+            stats["query_seconds"] += elapsed
+        if slow:
+            logger.warning("Slow query on %s (%.1f ms): %s", name, elapsed * 1000, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+
+def record_startup(report):
+    """
+    Keep the worker's startup report for the /metrics endpoint.
+    """
+    metrics.startup = report
+
+
+def setup_instrumentation(app, engines, slow_query_ms):
+    """
+    Install the metrics middleware, SQL hooks for `engines` and the `/metrics` endpoint.
+    - `engines`: Mapping of label -> synchronous engine (use `AsyncEngine.sync_engine`).
+    """
+    for name, engine in engines.items():
+        instrument_engine(engine, name, slow_query_ms)
+    app.add_middleware(MetricsMiddleware)
+
+    async def prometheus_metrics():
+        """
+        Expose request, SQL and connection-pool metrics in the Prometheus text format.
+        """
+        return Response(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    app.add_api_route("/metrics", prometheus_metrics, methods=["GET"], include_in_schema=False)
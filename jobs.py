@@ -0,0 +1,272 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from config import JOB_STALE_SECONDS
+from database import SessionLocal
+from models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# Number of finished jobs per kind kept for status lookups
+JOB_HISTORY = 100
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _to_db(value):
+    # DateTime columns hold naive UTC
+    return None if value is None else value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _from_db(value):
+    return None if value is None else value.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class Job:
+    """
+    Status of a background job, updated by the worker thread while it runs.
+    Jobs started by a `JobRunner` write every change through to `background_jobs`.
+    """
+
+    id: str
+    kind: str
+    status: str = "queued"  # queued, running, succeeded or failed
+    stage: Optional[str] = None
+    progress: float = 0.0
+    counts: dict = field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=_now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    runner: Optional["JobRunner"] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(
+            id=row.id,
+            kind=row.kind,
+            status=row.status,
+            stage=row.stage,
+            progress=row.progress,
+            counts=row.counts or {},
+            error=row.error,
+            created_at=_from_db(row.created_at),
+            started_at=_from_db(row.started_at),
+            finished_at=_from_db(row.finished_at),
+        )
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+    def report(self, stage, done=None, total=None):
+        """
+        Record the current stage and, when known, the fraction of work completed.
+        """
+        self.stage = stage
+        if total:
+            self.progress = round(done / total, 4)
+        if self.runner is not None:
+            self.runner.save(self)
+
+    def to_row(self):
+        return {
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "counts": self.counts,
+            "error": self.error,
+            "started_at": _to_db(self.started_at),
+            "finished_at": _to_db(self.finished_at),
+            "updated_at": _to_db(_now()),
+        }
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "counts": self.counts,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobRunner:
+    """
+    Runs jobs on a thread pool and keeps their status in `background_jobs`, so every worker
+    process can report on every job and at most one job per kind is active across workers.
+    - `session_factory`: Synchronous session factory used for the status writes.
+    - `stale_after`: Seconds without a status write after which an active job started by
+      another process counts as abandoned, e.g. because its worker was killed.
+    """
+
+    def __init__(self, session_factory=SessionLocal, max_workers=1, history=JOB_HISTORY,
+                 stale_after=JOB_STALE_SECONDS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="jobs")
+        self.session_factory = session_factory
+        self._history = history
+        self.stale_after = stale_after
+        self._owned = {}  # Active jobs started by this process
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, *args, **kwargs):
+        """
+        Queue `fn(job, *args, **kwargs)` unless a job of the same kind is active in any worker.
+        `fn` returns the job's row counts. Returns `(job, created)`, where `job` is the
+        already active job when `created` is False.
+        """
+        job = Job(id=uuid.uuid4().hex, kind=kind, runner=self)
+        with self.session_factory() as db:
+            active = self._claim(db, job)
+            if active is not None:
+                return Job.from_row(active), False
+            self._trim(db, kind)
+
+        with self._lock:
+            self._owned[job.id] = job
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job, True
+
+    def _claim(self, db, job, attempts=3):
+        """
+        Insert `job` as the active job of its kind. Returns None on success, or the row of
+        the job that is already active.
+        """
+        table = BackgroundJob.__table__
+        for _ in range(attempts):
+            try:
+                # The unique index on active_kind settles races between workers
+                db.execute(
+                    insert(table).values(
+                        id=job.id, kind=job.kind, active_kind=job.kind,
+                        created_at=_to_db(job.created_at), **job.to_row(),
+                    )
+                )
+                db.commit()
+                return None
+            except IntegrityError:
+                db.rollback()
+
+            active = db.execute(select(table).where(table.c.active_kind == job.kind)).first()
+            if active is None:
+                continue  # Finished in the meantime
+            if active.id not in self._owned and self._abandoned(active):
+                logger.warning("Job %s (%s) stopped reporting; marking it failed", active.id, active.kind)
+                self._finish(db, active.id, "Abandoned: its worker stopped reporting status")
+                continue
+            return active
+        raise RuntimeError(f"Could not start a '{job.kind}' job")
+
+    def _abandoned(self, row):
+        return _from_db(row.updated_at) < _now() - timedelta(seconds=self.stale_after)
+
+    def _finish(self, db, job_id, error):
+        table = BackgroundJob.__table__
+        now = _to_db(_now())
+        db.execute(
+            update(table)
+            .where(table.c.id == job_id, table.c.active_kind.is_not(None))
+            .values(status="failed", error=error, active_kind=None, finished_at=now, updated_at=now)
+        )
+        db.commit()
+
+    def _trim(self, db, kind):
+        """
+        Delete finished jobs of `kind` beyond the newest `history`.
+        """
+        table = BackgroundJob.__table__
+        old = list(db.scalars(
+            select(table.c.id)
+            .where(table.c.kind == kind, table.c.active_kind.is_(None))
+            .order_by(table.c.created_at.desc())
+            .offset(self._history)
+        ))
+        if old:
+            db.execute(delete(table).where(table.c.id.in_(old)))
+            db.commit()
+
+    def save(self, job):
+        """
+        Write the status of `job` to its row; a finished job releases its kind.
+        """
+        table = BackgroundJob.__table__
+        values = job.to_row()
+        if not job.active:
+            values["active_kind"] = None
+        with self.session_factory() as db:
+            db.execute(update(table).where(table.c.id == job.id).values(**values))
+            db.commit()
+
+    def _run(self, job, fn, args, kwargs):
+        try:
+            job.status = "running"
+            job.started_at = _now()
+            self.save(job)
+            job.counts = fn(job, *args, **kwargs) or {}
+            job.progress = 1.0
+            job.status = "succeeded"
+        except Exception as err:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            job.error = getattr(err, "detail", None) or str(err) or type(err).__name__
+            job.status = "failed"
+        finally:
+            job.finished_at = _now()
+            try:
+                self.save(job)
+            except Exception:
+                logger.exception("Could not record the result of job %s (%s)", job.id, job.kind)
+            with self._lock:
+                self._owned.pop(job.id, None)
+
+    def get(self, job_id):
+        table = BackgroundJob.__table__
+        with self.session_factory() as db:
+            row = db.execute(select(table).where(table.c.id == job_id)).first()
+        return Job.from_row(row) if row is not None else None
+
+    def recent(self, kind=None):
+        """
+        Return the newest jobs, newest first.
+        """
+        table = BackgroundJob.__table__
+        query = select(table).order_by(table.c.created_at.desc()).limit(self._history)
+        if kind is not None:
+            query = query.where(table.c.kind == kind)
+        with self.session_factory() as db:
+            return [Job.from_row(row) for row in db.execute(query)]
+
+    def shutdown(self):
+        """
+        Stop taking jobs and mark the active jobs of this process failed, so other workers
+        can start new ones right away.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            owned = list(self._owned)
+        if not owned:
+            return
+        try:
+            with self.session_factory() as db:
+                for job_id in owned:
+                    self._finish(db, job_id, "Interrupted: the worker shut down")
+        except Exception:
+            logger.exception("Could not release the active jobs of this worker")
+
+
+runner = JobRunner()
@@ -1,53 +1,132 @@
-import os
-from fastapi import FastAPI, Depends, HTTPException
-from sqlalchemy.orm import Session
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from faker import Faker
-
-from database import get_db, initialize_database
-from models import User, PlayerBoxScore, TeamBoxScore, CbbPredictions
-
-# Constants
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
-SAMPLE_SPREADSHEET_ID = "1zVJZjqTlAbDUAXBisTlcs5XBoocm4lHen3t0hWt5SEA"
-SAMPLE_RANGE_NAME = "predictions"
-
-# Initialize FastAPI and Faker
-app = FastAPI()
-fake = Faker()
-
-# Initialize the database
-initialize_database()
+import time
+
+# Measured before any other import so the startup report covers module loading
+IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from fastapi import Body, FastAPI, Depends, Header, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aggregates import (
+    ROLLING_STATS,
+    player_season_summary,
+    refresh_rollups,
+    rolling_form,
+    team_season_summary,
+)
+from caching import FastJSONResponse, bump_data_version, cache_headers, data_versions, not_modified
+from config import (
+    CREATE_SCHEMA_ON_STARTUP,
+    GZIP_MINIMUM_SIZE,
+    METRICS_ENABLED,
+    PREDICTION_INDEX_ENABLED,
+    SHEETS_CHUNK_ROWS,
+    SHEETS_FETCH_MODE,
+    SLOW_QUERY_MS,
+    SYNC_INTERVAL_SECONDS,
+)
+from database import (
+    SessionLocal,
+    advisory_lock,
+    all_engines,
+    get_async_db,
+    get_async_read_db,
+    get_read_session_factory,
+    initialize_database,
+    read_session_factory,
+)
+from export import EXPORT_MEDIA_TYPES, EXPORT_MODELS, build_export_query, stream_export
+from ingest import upsert_predictions
+from instrumentation import record_startup, setup_instrumentation
+from jobs import runner
+from models import (
+    User,
+    PlayerBoxScore,
+    TeamBoxScore,
+    CbbPredictions,
+    PlayerSeasonRollup,
+    TeamSeasonRollup,
+)
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from prediction_index import PREDICTION_COLUMNS, prediction_index
+from sheets import SAMPLE_RANGE_NAME, SAMPLE_SPREADSHEET_ID, get_sheets_client, iter_prediction_rows
+from streaming import STREAM_MEDIA_TYPES, negotiate_format, stream_rows
+from team_search import team_search_index
+from uploads import UPLOAD_MODELS, BoxScoreUpload, iter_lines, iter_records, upload_format
+from users import bulk_create_users, parse_user_items
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_SYNC_JOB = "prediction_sync"
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Optionally create the schema, build the in-memory prediction index and start the
+    periodic prediction sync, report startup timings, and stop background work on shutdown.
+    """
+    if CREATE_SCHEMA_ON_STARTUP:
+        await asyncio.to_thread(initialize_database)
+
+    # The team search index is built by the first search, so it never delays startup
+    if PREDICTION_INDEX_ENABLED:
+        try:
+            await asyncio.to_thread(prediction_index.rebuild, SessionLocal)
+        except Exception:
+            # /cbbpredictions/ falls back to the database until a sync rebuilds it
+            logger.exception("Could not build the %s", prediction_index.name)
+
+    scheduler = None
+    if SYNC_INTERVAL_SECONDS > 0:
+        scheduler = asyncio.create_task(schedule_prediction_sync(SYNC_INTERVAL_SECONDS))
+
+    app.state.startup_report = {
+        "import_seconds": round(IMPORT_SECONDS, 4),
+        "startup_seconds": round(time.perf_counter() - IMPORT_STARTED, 4),
+        "ready_at": datetime.now(timezone.utc).isoformat(),
+    }
+    record_startup(app.state.startup_report)
+    logger.info(
+        "Worker ready at %s: imports took %.3fs, startup %.3fs",
+        app.state.startup_report["ready_at"],
+        app.state.startup_report["import_seconds"],
+        app.state.startup_report["startup_seconds"],
+    )
+    yield
+    if scheduler is not None:
+        scheduler.cancel()
+    await asyncio.to_thread(runner.shutdown)
+
+
+# Initialize FastAPI
+app = FastAPI(lifespan=lifespan)
+
+# Per-route latency, SQL statement counts and the /metrics endpoint
+if METRICS_ENABLED:
+    setup_instrumentation(app, all_engines(), SLOW_QUERY_MS)
+
+# Compress large responses such as prediction pages and streams
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
 
 def fetch_predictions_from_sheets():
     """
     Fetch data from Google Sheets and filter the required columns.
     """
-    creds = None
-    # Load credentials from token.json or prompt user login
-    if os.path.exists("token.json"):
-        creds = Credentials.from_authorized_user_file("token.json", SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file("credentials.json", SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open("token.json", "w") as token:
-            token.write(creds.to_json())
+    from googleapiclient.errors import HttpError
 
     try:
-        # Build Sheets API service
-        service = build("sheets", "v4", credentials=creds)
-        sheet = service.spreadsheets()
-
-        # Fetch data from the specified sheet and range
-        result = sheet.values().get(spreadsheetId=SAMPLE_SPREADSHEET_ID, range=SAMPLE_RANGE_NAME).execute()
-        values = result.get("values", [])
+        # Fetch data from the specified sheet and range through the shared client
+        values = get_sheets_client().get_values(SAMPLE_SPREADSHEET_ID, SAMPLE_RANGE_NAME)
 
         if not values:
             return []
@@ -65,131 +144,532 @@ def fetch_predictions_from_sheets():
 
 
 @app.get("/")
-async def root(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+async def root(
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """
-    Fetch all users with optional pagination.
-    - `skip`: Number of records to skip (default: 0).
+    Fetch users ordered by ID with keyset pagination.
+    - `cursor`: Opaque `next_cursor` value from the previous page (default: first page).
     - `limit`: Maximum number of records to return (default: 10).
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    query = select(User).order_by(User.id).limit(limit + 1)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        query = query.where(User.id > last_id)
+
+    # One extra row tells whether another page follows
+    users = (await db.scalars(query)).all()
+    next_cursor = encode_cursor([users[limit - 1].id]) if len(users) > limit else None
+    return {"users": users[:limit], "next_cursor": next_cursor}
+
+
+# Registered before /users/{user_id}, which would otherwise match "me" and reject it
+@app.get("/users/me")
+async def read_user_me():
+    """
+    Placeholder endpoint for the current user.
+    """
+    return {"user_id": "the current user"}
 
 
 @app.get("/users/{user_id}")
-def read_user(user_id: int, db: Session = Depends(get_db)):
+async def read_user(user_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
     """
     Fetch a user by their ID.
+    Responses carry an ETag tied to the users data version; a matching `If-None-Match`
+    gets a 304 without looking up the user.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    headers = cache_headers(User.__tablename__, *await data_versions.get(db, User.__tablename__))
+    response = not_modified(request, headers)
+    if response is not None:
+        return response
+
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return {"id": user.id, "name": user.name, "email": user.email}
+    return FastJSONResponse({"id": user.id, "name": user.name, "email": user.email}, headers=headers)
 
 
 @app.post("/add_user/")
-def add_user(name: str, email: str, db: Session = Depends(get_db)):
+async def add_user(name: str, email: str, db: AsyncSession = Depends(get_async_db)):
     """
     Add a new user to the database.
     """
     # Check if the user already exists
-    existing_user = db.query(User).filter(User.email == email).first()
+    existing_user = await db.scalar(select(User).where(User.email == email))
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Create and save the new user
     new_user = User(name=name, email=email)
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.run_sync(bump_data_version, User.__tablename__)
+    await db.commit()
+    await db.refresh(new_user)
 
     return {"message": "User added successfully", "user_id": new_user.id}
 
 
-@app.get("/users/me")
-async def read_user_me():
+@app.post("/users/bulk")
+async def add_users_bulk(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
-    Placeholder endpoint for the current user.
+    Add many users at once from a JSON array or an NDJSON body (`Content-Type: application/x-ndjson`)
+    of `{"name": ..., "email": ...}` objects.
+    Users are inserted in batches and duplicate emails are rejected by the unique index, so each
+    item's result is either the new `id`, a `conflict` marker or validation `errors`.
     """
-    return {"user_id": "the current user"}
+    try:
+        items = parse_user_items(await request.body(), request.headers.get("content-type"))
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=f"Invalid request body: {err}")
+
+    results = await db.run_sync(bulk_create_users, items)
+    summary = {status: 0 for status in ("created", "conflict", "invalid")}
+    for result in results:
+        summary[result["status"]] += 1
+    return {**summary, "results": results}
+
+
+def sync_predictions(job, delete_missing=False, force=False):
+    """
+    Background job: fetch the predictions sheet and sync it into the database.
+    """
+    def report(done, total):
+        job.report("syncing", done, total)
+
+    job.report("fetching")
+    if SHEETS_FETCH_MODE == "full":
+        predictions = fetch_predictions_from_sheets()
+        if not predictions:
+            raise ValueError("No prediction data found.")
+        rows = predictions[1:]  # Skip the header row
+    else:
+        # Typed column ranges in row chunks, written as they arrive; progress follows the fetch
+        chunks = iter_prediction_rows(chunk_rows=SHEETS_CHUNK_ROWS, progress=report)
+        first_chunk = next(chunks, None)
+        if not first_chunk:
+            raise ValueError("No prediction data found.")
+        rows = itertools.chain(first_chunk, itertools.chain.from_iterable(chunks))
+
+    # Sync the rows in batches keyed on game_id
+    with advisory_lock("cbb_predictions_sync"), SessionLocal() as db:
+        job.report("syncing")
+        counts = upsert_predictions(db, rows, delete_missing=delete_missing, force=force, progress=report)
+
+    changed = counts["inserted"] or counts["updated"] or counts["deleted"]
+    for index in in_memory_indexes():
+        if index is team_search_index and index.snapshot is None:
+            continue  # Left to the first search
+        if changed or index.snapshot is None:
+            job.report("indexing")
+            index.rebuild(SessionLocal)
+    return counts
+
+
+def in_memory_indexes():
+    """
+    Return the in-memory prediction indexes this worker keeps up to date.
+    """
+    return [prediction_index, team_search_index] if PREDICTION_INDEX_ENABLED else [team_search_index]
+
+
+async def schedule_prediction_sync(interval):
+    """
+    Queue a prediction sync every `interval` seconds; runs already in progress are not duplicated.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(runner.submit, PREDICTION_SYNC_JOB, sync_predictions)
+        except Exception:
+            logger.exception("Could not queue the scheduled prediction sync")
+
+
+@app.post("/cbbpredictions/fetch-and-save/", status_code=202)
+async def fetch_and_save_predictions(delete_missing: bool = False, force: bool = False):
+    """
+    Start a background job that fetches prediction data from Google Sheets and syncs it
+    into the database. Rows are matched on `game_id` and only new or changed rows are written.
+    Only one sync runs at a time across all workers; while one is active its job is returned instead.
+    - `delete_missing`: Delete predictions that were removed from the sheet (default: False).
+    - `force`: Rewrite every row even if it is unchanged (default: False).
+    """
+    job, created = await asyncio.to_thread(
+        runner.submit, PREDICTION_SYNC_JOB, sync_predictions, delete_missing=delete_missing, force=force
+    )
+    message = "Prediction sync started" if created else "A prediction sync is already running"
+    return {"message": message, "job_id": job.id, "status": job.status}
+
+
+@app.get("/cbbpredictions/jobs/")
+async def list_sync_jobs():
+    """
+    List recent prediction sync jobs, newest first.
+    """
+    jobs = await asyncio.to_thread(runner.recent, PREDICTION_SYNC_JOB)
+    return {"jobs": [job.to_dict() for job in jobs]}
+
+
+@app.get("/cbbpredictions/jobs/{job_id}")
+async def get_sync_job(job_id: str):
+    """
+    Fetch the status, progress, row counts and error of a prediction sync job.
+    """
+    job = await asyncio.to_thread(runner.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+def prediction_to_dict(prediction):
+    """
+    Convert a `CbbPredictions` row or selected column row into a dictionary for JSON serialization.
+    """
+    return {
+        "no": prediction.no,
+        "game_date": prediction.game_date,
+        "game_id": prediction.game_id,
+        "away_team_full_name": prediction.away_team_full_name,
+        "home_team_full_name": prediction.home_team_full_name,
+        "prediction_alternate": prediction.prediction_alternate,
+        "prediction_use": prediction.prediction_use,
+        "book_line": prediction.book_line,
+        "edge_v4": prediction.edge_v4,
+    }
 
 
-@app.post("/cbbpredictions/fetch-and-save/")
-async def fetch_and_save_predictions(db: Session = Depends(get_db)):
+def decode_prediction_cursor(cursor):
     """
-    Fetch prediction data from Google Sheets and save to the database.
+    Decode a `/cbbpredictions/` cursor into the (game_date, no) of the last row returned.
     """
-    predictions = fetch_predictions_from_sheets()
+    last_date, last_no = decode_cursor(cursor, 2)
+    if last_date is None:
+        return None, last_no
+    try:
+        return date.fromisoformat(last_date), last_no
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    if not predictions:
-        raise HTTPException(status_code=404, detail="No prediction data found.")
 
-    for row in predictions[1:]:
-        print(row)
-        if len(row) < 8:  # Ensure row has enough columns
-            continue
-        new_prediction = CbbPredictions(
-            game_date=row[0],  # Ensure this is formatted as a valid date
-            game_id=row[1],
-            away_team_full_name=row[2],
-            home_team_full_name=row[3],
-            prediction_alternate=float(row[4]) if row[4] else None,
-            prediction_use=float(row[5]) if row[5] else None,
-            book_line=float(row[6]) if row[6] else None,
-            edge_v4=float(row[7]) if row[7] else None,
+def predictions_after(cursor):
+    """
+    Build the keyset condition selecting predictions after `cursor` in (game_date, no) order.
+    Rows without a game_date sort first, as they do on MySQL and SQLite.
+    """
+    last_date, last_no = decode_prediction_cursor(cursor)
+    if last_date is None:
+        return or_(
+            and_(CbbPredictions.game_date.is_(None), CbbPredictions.no > last_no),
+            CbbPredictions.game_date.is_not(None),
         )
-        db.add(new_prediction)
+    return or_(
+        CbbPredictions.game_date > last_date,
+        and_(CbbPredictions.game_date == last_date, CbbPredictions.no > last_no),
+    )
 
-    db.commit()
-    return {"message": "Predictions fetched and saved successfully!"}
 
-from typing import Optional
-from sqlalchemy import and_
+def filter_predictions(query, start_date, end_date, lowest_book_line, highest_book_line, cursor):
+    """
+    Apply the `/cbbpredictions/` filters and keyset cursor to a select on `CbbPredictions`.
+    """
+    if start_date:
+        query = query.where(CbbPredictions.game_date >= start_date)
+    if end_date:
+        query = query.where(CbbPredictions.game_date <= end_date)
+    if lowest_book_line is not None:
+        query = query.where(CbbPredictions.book_line >= lowest_book_line)
+    if highest_book_line is not None:
+        query = query.where(CbbPredictions.book_line <= highest_book_line)
+    if cursor:
+        query = query.where(predictions_after(cursor))
+    return query.order_by(CbbPredictions.game_date, CbbPredictions.no)
+
 
 @app.get("/cbbpredictions/")
-def get_filtered_predictions(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+async def get_filtered_predictions(
+    request: Request,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
     lowest_book_line: Optional[float] = None,
     highest_book_line: Optional[float] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    format: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    session_factory=Depends(get_read_session_factory),
 ):
     """
-    Get filtered predictions based on query parameters.
+    Get filtered predictions ordered by (game_date, no) with keyset pagination.
     - `start_date`: Filter predictions with game_date >= start_date.
     - `end_date`: Filter predictions with game_date <= end_date.
     - `lowest_book_line`: Filter predictions with book_line >= lowest_book_line.
     - `highest_book_line`: Filter predictions with book_line <= highest_book_line.
+    - `cursor`: Opaque `next_cursor` value from the previous page (default: first page).
+    - `limit`: Maximum number of records to return (default: 100).
+    - `format`: `json`, `ndjson` or `csv` (default: taken from the Accept header, else `json`).
+      NDJSON and CSV stream every matching row and ignore `limit`.
+    JSON pages come from the in-memory prediction index when it is enabled and built.
+    Responses carry an ETag tied to the predictions data version; a matching `If-None-Match`
+    gets a 304 without querying.
     """
-    # Start a query on the CbbPredictions model
-    query = db.query(CbbPredictions)
-    
-    # Apply filters based on provided parameters
-    if start_date:
-        query = query.filter(CbbPredictions.game_date >= start_date)
-    if end_date:
-        query = query.filter(CbbPredictions.game_date <= end_date)
-    if lowest_book_line is not None:
-        query = query.filter(CbbPredictions.book_line >= lowest_book_line)
-    if highest_book_line is not None:
-        query = query.filter(CbbPredictions.book_line <= highest_book_line)
+    response_format = negotiate_format(format, accept)
+    version, updated_at = await data_versions.get(db, CbbPredictions.__tablename__)
+    headers = cache_headers(CbbPredictions.__tablename__, version, updated_at, variant=response_format)
+    headers["Vary"] = "Accept"
+    response = not_modified(request, headers)
+    if response is not None:
+        return response
+
+    snapshot = prediction_index.snapshot
+    if PREDICTION_INDEX_ENABLED and (snapshot is None or snapshot.version < version):
+        # Another worker synced newer predictions; answer from the database until rebuilt
+        prediction_index.rebuild_in_background(SessionLocal)
+        snapshot = None
+    if response_format == "json" and snapshot is not None:
+        # Answer from the in-memory snapshot without touching the database
+        after = decode_prediction_cursor(cursor) if cursor else None
+        predictions = snapshot.query(
+            start_date, end_date, lowest_book_line, highest_book_line, after, limit + 1
+        )
+        next_cursor = None
+        if len(predictions) > limit:
+            last = predictions[limit - 1]
+            next_cursor = encode_cursor([last["game_date"], last["no"]])
+        return FastJSONResponse(
+            {"filtered_predictions": predictions[:limit], "next_cursor": next_cursor}, headers=headers
+        )
+
+    # Select plain columns so rows are never hydrated into ORM objects
+    query = filter_predictions(
+        select(*PREDICTION_COLUMNS),
+        start_date, end_date, lowest_book_line, highest_book_line, cursor,
+    )
+
+    if response_format != "json":
+        return StreamingResponse(
+            stream_rows(session_factory, query, response_format),
+            media_type=STREAM_MEDIA_TYPES[response_format],
+            headers=headers,
+        )
+
+    # Execute the query and fetch one extra row to tell whether another page follows
+    predictions = (await db.execute(query.limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(predictions) > limit:
+        last = predictions[limit - 1]
+        next_cursor = encode_cursor([last.game_date, last.no])
 
-    # Execute the query and fetch results
-    predictions = query.all()
-    
     # Convert results to a list of dictionaries for easier JSON serialization
-    result = [
+    result = [prediction_to_dict(prediction) for prediction in predictions[:limit]]
+
+    return FastJSONResponse({"filtered_predictions": result, "next_cursor": next_cursor}, headers=headers)
+
+
+@app.get("/cbbpredictions/search")
+async def search_predictions(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100),
+    fuzzy: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Search predictions by away or home team name, ordered by (game_date, no) with keyset pagination.
+    Matching ignores case and accents and is served from an in-memory index of team names.
+    - `q`: Start of any word of a team name, e.g. `duke` or `north car`.
+    - `fuzzy`: Also match team names or words that are spelled similarly (default: False).
+    - `cursor`: Opaque `next_cursor` value from the previous page (default: first page).
+    - `limit`: Maximum number of records to return (default: 100).
+    Responses carry an ETag tied to the data version of the index that answered them.
+    """
+    version, updated_at = await data_versions.get(db, CbbPredictions.__tablename__)
+    snapshot = team_search_index.snapshot
+    if snapshot is None:
+        snapshot = await asyncio.to_thread(team_search_index.rebuild, SessionLocal)
+    elif snapshot.version < version:
+        # Serve the previous index while another worker's sync is indexed
+        team_search_index.rebuild_in_background(SessionLocal)
+
+    # Validators describe the snapshot actually served, so a stale body is never cached
+    # under the newer version; its modification time is unknown
+    if snapshot.version != version:
+        updated_at = None
+    headers = cache_headers(CbbPredictions.__tablename__, snapshot.version, updated_at, variant="search")
+    response = not_modified(request, headers)
+    if response is not None:
+        return response
+
+    after = decode_prediction_cursor(cursor) if cursor else None
+    teams, predictions = snapshot.search(q, fuzzy, after, limit + 1)
+    next_cursor = None
+    if len(predictions) > limit:
+        last = predictions[limit - 1]
+        next_cursor = encode_cursor([last["game_date"], last["no"]])
+    predictions = predictions[:limit]
+    return FastJSONResponse(
         {
-            "no": prediction.no,
-            "game_date": prediction.game_date,
-            "game_id": prediction.game_id,
-            "away_team_full_name": prediction.away_team_full_name,
-            "home_team_full_name": prediction.home_team_full_name,
-            "prediction_alternate": prediction.prediction_alternate,
-            "prediction_use": prediction.prediction_use,
-            "book_line": prediction.book_line,
-            "edge_v4": prediction.edge_v4,
-        }
-        for prediction in predictions
-    ]
-
-    return {"filtered_predictions": result}
\ No newline at end of file
+            "teams": teams,
+            "game_ids": [prediction["game_id"] for prediction in predictions],
+            "predictions": predictions,
+            "next_cursor": next_cursor,
+        },
+        headers=headers,
+    )
+
+
+@app.get("/export/{table_name}")
+async def export_box_scores(
+    table_name: str,
+    format: str = Query("arrow", pattern="^(arrow|parquet)$"),
+    columns: Optional[str] = None,
+    season: Optional[int] = None,
+    team_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_teams: bool = False,
+):
+    """
+    Export a box-score table or the teams table as an Apache Arrow IPC stream or a Parquet file.
+    - `table_name`: `player_box_score`, `team_box_score` or `teams`.
+    - `format`: `arrow` or `parquet` (default: `arrow`).
+    - `columns`: Comma-separated column names to include (default: all columns).
+    - `season`, `team_id`: Filter on exact values (`teams` supports only `team_id`).
+    - `start_date`, `end_date`: Filter on game_date within the inclusive range.
+    - `include_teams`: Add the team and opponent attributes (`team_name`, `opponent_team_logo`, ...)
+      from `teams` to box-score rows (default: False).
+    """
+    model = EXPORT_MODELS.get(table_name)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Table not found")
+
+    selected = [name.strip() for name in columns.split(",") if name.strip()] if columns else None
+    query, schema = build_export_query(
+        model, selected, season, team_id, start_date, end_date, include_teams
+    )
+
+    extension = "parquet" if format == "parquet" else "arrows"
+    return StreamingResponse(
+        stream_export(read_session_factory(), query, schema, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table_name}.{extension}"'},
+    )
+
+
+@app.get("/aggregates/players/{athlete_id}")
+async def get_player_aggregates(
+    athlete_id: int,
+    season: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Fetch per-season averages, shooting percentages and per-minute rates for an athlete.
+    - `season`: Only return this season (default: all seasons).
+    """
+    query = select(PlayerSeasonRollup).where(PlayerSeasonRollup.athlete_id == athlete_id)
+    if season is not None:
+        query = query.where(PlayerSeasonRollup.season == season)
+    rollups = (await db.scalars(query.order_by(PlayerSeasonRollup.season))).all()
+    if not rollups:
+        raise HTTPException(status_code=404, detail="No aggregates found for athlete")
+    return {"seasons": [player_season_summary(rollup) for rollup in rollups]}
+
+
+@app.get("/aggregates/players/{athlete_id}/rolling")
+async def get_player_rolling_form(
+    athlete_id: int,
+    window: int = Query(5, ge=1, le=100),
+    stats: str = "points,rebounds,assists",
+    season: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Compute rolling last-N-games averages for an athlete.
+    - `window`: Number of games per window (default: 5).
+    - `stats`: Comma-separated box-score columns to average (default: points, rebounds, assists).
+    - `season`: Only use games from this season (default: all games).
+    """
+    names = [name.strip() for name in stats.split(",") if name.strip()]
+    unknown = [name for name in names if name not in ROLLING_STATS]
+    if not names or unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported stats: {', '.join(unknown) or stats}")
+
+    box = PlayerBoxScore.__table__
+    query = select(box.c.game_id, box.c.game_date, *[box.c[name] for name in names]).where(
+        box.c.athlete_id == athlete_id
+    )
+    if season is not None:
+        query = query.where(box.c.season == season)
+    rows = (await db.execute(query.order_by(box.c.game_date, box.c.game_id))).all()
+    return rolling_form(rows, names, window)
+
+
+@app.get("/aggregates/teams/{team_id}")
+async def get_team_aggregates(
+    team_id: int,
+    season: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """
+    Fetch per-season record, averages and shooting percentages for a team.
+    - `season`: Only return this season (default: all seasons).
+    """
+    query = select(TeamSeasonRollup).where(TeamSeasonRollup.team_id == team_id)
+    if season is not None:
+        query = query.where(TeamSeasonRollup.season == season)
+    rollups = (await db.scalars(query.order_by(TeamSeasonRollup.season))).all()
+    if not rollups:
+        raise HTTPException(status_code=404, detail="No aggregates found for team")
+    return {"seasons": [team_season_summary(rollup) for rollup in rollups]}
+
+
+@app.post("/aggregates/refresh")
+async def refresh_aggregates(game_ids: List[int] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    """
+    Incrementally update the season rollups for the given game IDs after new box scores arrive.
+    """
+    counts = await db.run_sync(refresh_rollups, game_ids)
+    return {"message": "Aggregates refreshed", **counts}
+
+
+@app.post("/import/{table_name}")
+async def import_box_scores(
+    table_name: str,
+    request: Request,
+    format: Optional[str] = None,
+    refresh_aggregates: bool = True,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Load box scores from an NDJSON or CSV request body, upserting on the table's primary key.
+    The body is parsed and validated as it streams in and written in fixed-size batches,
+    each committed on its own, so a failed upload can simply be sent again.
+    Team and opponent attributes such as `team_name` or `opponent_team_logo` are stored in `teams`.
+    - `table_name`: `player_box_score` (keyed on game_id, athlete_id) or `team_box_score` (keyed on game_id).
+    - `format`: `ndjson` or `csv` (default: taken from the Content-Type header).
+    - `refresh_aggregates`: Update the season rollups of the loaded games afterwards (default: True).
+    Returns row and team counts, ignored column names and up to 100 rejected rows with their line numbers.
+    """
+    model = UPLOAD_MODELS.get(table_name)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Table not found")
+    body_format = upload_format(format, request.headers.get("content-type"))
+
+    upload = BoxScoreUpload(model)
+    async for line_number, record in iter_records(iter_lines(request.stream()), body_format):
+        if upload.add(line_number, record):
+            await db.run_sync(upload.write_batch)
+    await db.run_sync(upload.write_batch)
+
+    summary = upload.summary()
+    if refresh_aggregates and upload.game_ids:
+        summary["aggregates"] = await db.run_sync(refresh_rollups, list(upload.game_ids))
+    return summary
+
+
+# Module import time, reported once the worker is ready
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
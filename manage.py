@@ -0,0 +1,112 @@
+import argparse
+import os
+import re
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, insert, inspect, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from database import engine, initialize_database
+from models import Base
+
+# Numbered MySQL scripts applied in file-name order by `migrate`
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE = re.compile(r"^\d{4}_\w+\.sql$")
+
+# Kept outside models.Base so create-schema never creates or stamps it
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(255), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def migration_files():
+    return sorted(name for name in os.listdir(MIGRATIONS_DIR) if MIGRATION_FILE.match(name))
+
+
+def split_statements(sql):
+    """
+    Split a migration script into statements, dropping `--` comment lines.
+    """
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def migrate(bind, fake=False, dry_run=False):
+    """
+    Apply the migrations not yet recorded in `schema_migrations`, one file per transaction.
+    MySQL commits DDL implicitly, so a failing file must be fixed by hand before re-running.
+    - `fake`: Record pending migrations as applied without running them, e.g. for a database
+      built by `create-schema`, which already has the final schema.
+    - `dry_run`: Only list the pending migrations.
+    Returns the names of the pending migrations.
+    """
+    if bind.dialect.name != "mysql" and not (fake or dry_run):
+        raise SystemExit("Migrations are written for MySQL; create other databases with create-schema")
+
+    applied = set()
+    if inspect(bind).has_table(schema_migrations.name):
+        with bind.connect() as connection:
+            applied = set(connection.scalars(select(schema_migrations.c.version)))
+    elif not dry_run:
+        schema_migrations.create(bind)
+    pending = [name for name in migration_files() if name not in applied]
+
+    for name in pending:
+        print(f"{'Pending' if dry_run else 'Faking' if fake else 'Applying'} {name}")
+        if dry_run:
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, name)) as migration_file:
+            statements = split_statements(migration_file.read())
+        with bind.begin() as connection:
+            if not fake:
+                for statement in statements:
+                    connection.exec_driver_sql(statement)
+            applied_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            connection.execute(insert(schema_migrations).values(version=name, applied_at=applied_at))
+    return pending
+
+
+def dump_schema():
+    """
+    Render the MySQL DDL of every table defined in models.py.
+    """
+    dialect = mysql.dialect()
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            statements.append(str(CreateIndex(index).compile(dialect=dialect)))
+    statements = [
+        "\n".join(line.rstrip().replace("\t", "  ") for line in statement.strip().splitlines())
+        for statement in statements
+    ]
+    header = "-- Generated from models.py by `python manage.py dump-schema`; do not edit by hand.\n\n"
+    return header + ";\n\n".join(statements) + ";\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database management commands.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("create-schema", help="Create every table defined in models.py that does not exist yet")
+    migrate_parser = commands.add_parser("migrate", help="Apply pending SQL migrations from migrations/ (MySQL)")
+    migrate_parser.add_argument("--fake", action="store_true", help="Record pending migrations without running them")
+    migrate_parser.add_argument("--dry-run", action="store_true", help="Only list pending migrations")
+    commands.add_parser("dump-schema", help="Print the MySQL DDL of the ORM models (see create_table_query.sql)")
+    args = parser.parse_args()
+
+    if args.command == "create-schema":
+        initialize_database()
+        print("Schema created")
+    elif args.command == "migrate":
+        pending = migrate(engine, fake=args.fake, dry_run=args.dry_run)
+        print(f"{len(pending)} migration(s) {'pending' if args.dry_run else 'recorded'}")
+    elif args.command == "dump-schema":
+        print(dump_schema(), end="")
+
+
+if __name__ == "__main__":
+    main()
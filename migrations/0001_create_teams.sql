@@ -0,0 +1,60 @@
+-- Team dimension table, filled from the team attributes repeated on every box-score row.
+CREATE TABLE IF NOT EXISTS `teams` (
+  `team_id` INT NOT NULL,
+  `team_uid` VARCHAR(255) NULL,
+  `team_slug` VARCHAR(255) NULL,
+  `team_location` VARCHAR(255) NULL,
+  `team_name` VARCHAR(255) NULL,
+  `team_abbreviation` VARCHAR(255) NULL,
+  `team_display_name` VARCHAR(255) NULL,
+  `team_short_display_name` VARCHAR(255) NULL,
+  `team_color` VARCHAR(255) NULL,
+  `team_alternate_color` VARCHAR(255) NULL,
+  `team_logo` VARCHAR(255) NULL,
+  PRIMARY KEY (`team_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- team_box_score carries every attribute, so it is read first; INSERT IGNORE keeps the first source per team
+INSERT IGNORE INTO `teams` (
+  `team_id`, `team_uid`, `team_slug`, `team_location`, `team_name`, `team_abbreviation`,
+  `team_display_name`, `team_short_display_name`, `team_color`, `team_alternate_color`, `team_logo`
+)
+SELECT `team_id`, MAX(`team_uid`), MAX(`team_slug`), MAX(`team_location`), MAX(`team_name`),
+       MAX(`team_abbreviation`), MAX(`team_display_name`), MAX(`team_short_display_name`),
+       MAX(`team_color`), MAX(`team_alternate_color`), MAX(`team_logo`)
+FROM `team_box_score`
+GROUP BY `team_id`;
+
+INSERT IGNORE INTO `teams` (
+  `team_id`, `team_uid`, `team_slug`, `team_location`, `team_name`, `team_abbreviation`,
+  `team_display_name`, `team_short_display_name`, `team_color`, `team_alternate_color`, `team_logo`
+)
+SELECT `opponent_team_id`, MAX(`opponent_team_uid`), MAX(`opponent_team_slug`), MAX(`opponent_team_location`),
+       MAX(`opponent_team_name`), MAX(`opponent_team_abbreviation`), MAX(`opponent_team_display_name`),
+       MAX(`opponent_team_short_display_name`), MAX(`opponent_team_color`), MAX(`opponent_team_alternate_color`),
+       MAX(`opponent_team_logo`)
+FROM `team_box_score`
+WHERE `opponent_team_id` IS NOT NULL
+GROUP BY `opponent_team_id`;
+
+INSERT IGNORE INTO `teams` (
+  `team_id`, `team_uid`, `team_slug`, `team_location`, `team_name`, `team_abbreviation`,
+  `team_display_name`, `team_short_display_name`, `team_color`, `team_alternate_color`, `team_logo`
+)
+SELECT `team_id`, MAX(`team_uid`), MAX(`team_slug`), MAX(`team_location`), MAX(`team_name`),
+       MAX(`team_abbreviation`), MAX(`team_display_name`), MAX(`team_short_display_name`),
+       MAX(`team_color`), MAX(`team_alternate_color`), MAX(`team_logo`)
+FROM `player_box_score`
+WHERE `team_id` IS NOT NULL
+GROUP BY `team_id`;
+
+INSERT IGNORE INTO `teams` (
+  `team_id`, `team_location`, `team_name`, `team_abbreviation`, `team_display_name`,
+  `team_color`, `team_alternate_color`, `team_logo`
+)
+SELECT `opponent_team_id`, MAX(`opponent_team_location`), MAX(`opponent_team_name`),
+       MAX(`opponent_team_abbreviation`), MAX(`opponent_team_display_name`), MAX(`opponent_team_color`),
+       MAX(`opponent_team_alternate_color`), MAX(`opponent_team_logo`)
+FROM `player_box_score`
+WHERE `opponent_team_id` IS NOT NULL
+GROUP BY `opponent_team_id`;
@@ -0,0 +1,34 @@
+-- Store box-score dates as DATE/DATETIME instead of VARCHAR(255) so range filters and
+-- ordering compare dates rather than strings. Values are copied through typed columns:
+-- ISO dates keep their first 10 characters, ISO timestamps lose their 'T' and 'Z'.
+ALTER TABLE `player_box_score`
+  ADD COLUMN `game_date_typed` DATE NULL AFTER `game_date`,
+  ADD COLUMN `game_date_time_typed` DATETIME NULL AFTER `game_date_time`;
+
+UPDATE `player_box_score`
+SET `game_date_typed` = CAST(LEFT(NULLIF(`game_date`, ''), 10) AS DATE),
+    `game_date_time_typed` = CAST(REPLACE(REPLACE(NULLIF(`game_date_time`, ''), 'T', ' '), 'Z', '') AS DATETIME);
+
+ALTER TABLE `player_box_score`
+  DROP COLUMN `game_date`,
+  DROP COLUMN `game_date_time`;
+
+ALTER TABLE `player_box_score`
+  RENAME COLUMN `game_date_typed` TO `game_date`,
+  RENAME COLUMN `game_date_time_typed` TO `game_date_time`;
+
+ALTER TABLE `team_box_score`
+  ADD COLUMN `game_date_typed` DATE NULL AFTER `game_date`,
+  ADD COLUMN `game_date_time_typed` DATETIME NULL AFTER `game_date_time`;
+
+UPDATE `team_box_score`
+SET `game_date_typed` = CAST(LEFT(NULLIF(`game_date`, ''), 10) AS DATE),
+    `game_date_time_typed` = CAST(REPLACE(REPLACE(NULLIF(`game_date_time`, ''), 'T', ' '), 'Z', '') AS DATETIME);
+
+ALTER TABLE `team_box_score`
+  DROP COLUMN `game_date`,
+  DROP COLUMN `game_date_time`;
+
+ALTER TABLE `team_box_score`
+  RENAME COLUMN `game_date_typed` TO `game_date`,
+  RENAME COLUMN `game_date_time_typed` TO `game_date_time`;
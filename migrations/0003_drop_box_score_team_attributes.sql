@@ -0,0 +1,41 @@
+-- Team and opponent attributes now live in `teams` (0001); box scores keep only the ids.
+ALTER TABLE `player_box_score`
+  DROP COLUMN `team_name`,
+  DROP COLUMN `team_location`,
+  DROP COLUMN `team_short_display_name`,
+  DROP COLUMN `team_display_name`,
+  DROP COLUMN `team_uid`,
+  DROP COLUMN `team_slug`,
+  DROP COLUMN `team_logo`,
+  DROP COLUMN `team_abbreviation`,
+  DROP COLUMN `team_color`,
+  DROP COLUMN `team_alternate_color`,
+  DROP COLUMN `opponent_team_name`,
+  DROP COLUMN `opponent_team_location`,
+  DROP COLUMN `opponent_team_display_name`,
+  DROP COLUMN `opponent_team_abbreviation`,
+  DROP COLUMN `opponent_team_logo`,
+  DROP COLUMN `opponent_team_color`,
+  DROP COLUMN `opponent_team_alternate_color`;
+
+ALTER TABLE `team_box_score`
+  DROP COLUMN `team_uid`,
+  DROP COLUMN `team_slug`,
+  DROP COLUMN `team_location`,
+  DROP COLUMN `team_name`,
+  DROP COLUMN `team_abbreviation`,
+  DROP COLUMN `team_display_name`,
+  DROP COLUMN `team_short_display_name`,
+  DROP COLUMN `team_color`,
+  DROP COLUMN `team_alternate_color`,
+  DROP COLUMN `team_logo`,
+  DROP COLUMN `opponent_team_uid`,
+  DROP COLUMN `opponent_team_slug`,
+  DROP COLUMN `opponent_team_location`,
+  DROP COLUMN `opponent_team_name`,
+  DROP COLUMN `opponent_team_abbreviation`,
+  DROP COLUMN `opponent_team_display_name`,
+  DROP COLUMN `opponent_team_short_display_name`,
+  DROP COLUMN `opponent_team_color`,
+  DROP COLUMN `opponent_team_alternate_color`,
+  DROP COLUMN `opponent_team_logo`;
@@ -0,0 +1,25 @@
+-- Replace single-column indexes with composite indexes matched to the query shapes:
+--   /cbbpredictions/ filters a game_date range and then a book_line range,
+--   player rolling form and rollups select by (athlete_id, season),
+--   team rollups select by (team_id, season).
+-- Dropped indexes are the ones create_all built for the former `index=True` columns; the
+-- primary keys already cover lookups by `no` and by `game_id`.
+ALTER TABLE `cbb_predictions`
+  DROP INDEX `ix_cbb_predictions_no`,
+  DROP INDEX `ix_cbb_predictions_game_date`,
+  DROP INDEX `ix_cbb_predictions_away_team_full_name`,
+  DROP INDEX `ix_cbb_predictions_home_team_full_name`,
+  DROP INDEX `ix_cbb_predictions_prediction_alternate`,
+  DROP INDEX `ix_cbb_predictions_prediction_use`,
+  DROP INDEX `ix_cbb_predictions_book_line`,
+  DROP INDEX `ix_cbb_predictions_edge_v4`,
+  ADD INDEX `ix_cbb_predictions_game_date_book_line` (`game_date`, `book_line`);
+
+ALTER TABLE `player_box_score`
+  DROP INDEX `ix_player_box_score_game_id`,
+  DROP INDEX `ix_player_box_score_athlete_id`,
+  ADD INDEX `ix_player_box_score_athlete_id_season` (`athlete_id`, `season`);
+
+ALTER TABLE `team_box_score`
+  DROP INDEX `ix_team_box_score_game_id`,
+  ADD INDEX `ix_team_box_score_team_id_season` (`team_id`, `season`);
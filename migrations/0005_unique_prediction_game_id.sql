@@ -0,0 +1,13 @@
+-- Predictions are upserted on game_id (ON DUPLICATE KEY UPDATE), which needs a unique key,
+-- and delta syncs compare a stored content fingerprint.
+-- Earlier syncs appended a new row per fetch; keep the latest row of every game_id.
+DELETE `older`
+FROM `cbb_predictions` AS `older`
+JOIN `cbb_predictions` AS `newer`
+  ON `newer`.`game_id` = `older`.`game_id` AND `newer`.`no` > `older`.`no`;
+
+-- Existing rows start without a fingerprint, so the next sync rewrites them once and fills it in.
+ALTER TABLE `cbb_predictions`
+  ADD COLUMN `row_hash` VARCHAR(64) NULL AFTER `edge_v4`,
+  DROP INDEX `ix_cbb_predictions_game_id`,
+  ADD UNIQUE INDEX `ix_cbb_predictions_game_id` (`game_id`);
@@ -0,0 +1,85 @@
+-- Per-table write counters behind the ETags of the read endpoints; a missing row reads as version 0.
+CREATE TABLE IF NOT EXISTS `data_versions` (
+  `table_name` VARCHAR(64) NOT NULL,
+  `version` INT NOT NULL,
+  `updated_at` DATETIME NULL,
+  PRIMARY KEY (`table_name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- Season totals kept up to date by aggregates.refresh_rollups as box scores are loaded.
+CREATE TABLE IF NOT EXISTS `player_season_rollup` (
+  `athlete_id` INT NOT NULL,
+  `season` INT NOT NULL,
+  `games` INT NOT NULL,
+  `minutes` FLOAT NOT NULL,
+  `points` INT NOT NULL,
+  `rebounds` INT NOT NULL,
+  `assists` INT NOT NULL,
+  `steals` INT NOT NULL,
+  `blocks` INT NOT NULL,
+  `turnovers` INT NOT NULL,
+  `field_goals_made` INT NOT NULL,
+  `field_goals_attempted` INT NOT NULL,
+  `three_point_field_goals_made` INT NOT NULL,
+  `three_point_field_goals_attempted` INT NOT NULL,
+  `free_throws_made` INT NOT NULL,
+  `free_throws_attempted` INT NOT NULL,
+  PRIMARY KEY (`athlete_id`, `season`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+CREATE TABLE IF NOT EXISTS `team_season_rollup` (
+  `team_id` INT NOT NULL,
+  `season` INT NOT NULL,
+  `games` INT NOT NULL,
+  `wins` INT NOT NULL,
+  `points` INT NOT NULL,
+  `opponent_points` INT NOT NULL,
+  `rebounds` INT NOT NULL,
+  `assists` INT NOT NULL,
+  `steals` INT NOT NULL,
+  `blocks` INT NOT NULL,
+  `turnovers` INT NOT NULL,
+  `field_goals_made` INT NOT NULL,
+  `field_goals_attempted` INT NOT NULL,
+  `three_point_field_goals_made` INT NOT NULL,
+  `three_point_field_goals_attempted` INT NOT NULL,
+  `free_throws_made` INT NOT NULL,
+  `free_throws_attempted` INT NOT NULL,
+  PRIMARY KEY (`team_id`, `season`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- Backfill from the box scores already loaded, with the aggregates of aggregates.py;
+-- REPLACE keeps this safe on tables create-schema already made.
+REPLACE INTO `player_season_rollup` (
+  `athlete_id`, `season`, `games`, `minutes`, `points`, `rebounds`, `assists`, `steals`, `blocks`,
+  `turnovers`, `field_goals_made`, `field_goals_attempted`, `three_point_field_goals_made`,
+  `three_point_field_goals_attempted`, `free_throws_made`, `free_throws_attempted`
+)
+SELECT `athlete_id`, `season`,
+       COALESCE(SUM(CASE WHEN `minutes` > 0 THEN 1 ELSE 0 END), 0),
+       COALESCE(SUM(`minutes`), 0), COALESCE(SUM(`points`), 0), COALESCE(SUM(`rebounds`), 0),
+       COALESCE(SUM(`assists`), 0), COALESCE(SUM(`steals`), 0), COALESCE(SUM(`blocks`), 0),
+       COALESCE(SUM(`turnovers`), 0), COALESCE(SUM(`field_goals_made`), 0),
+       COALESCE(SUM(`field_goals_attempted`), 0), COALESCE(SUM(`three_point_field_goals_made`), 0),
+       COALESCE(SUM(`three_point_field_goals_attempted`), 0), COALESCE(SUM(`free_throws_made`), 0),
+       COALESCE(SUM(`free_throws_attempted`), 0)
+FROM `player_box_score`
+WHERE `season` IS NOT NULL
+GROUP BY `athlete_id`, `season`;
+
+REPLACE INTO `team_season_rollup` (
+  `team_id`, `season`, `games`, `wins`, `points`, `opponent_points`, `rebounds`, `assists`, `steals`,
+  `blocks`, `turnovers`, `field_goals_made`, `field_goals_attempted`, `three_point_field_goals_made`,
+  `three_point_field_goals_attempted`, `free_throws_made`, `free_throws_attempted`
+)
+SELECT `team_id`, `season`, COUNT(*),
+       COALESCE(SUM(CASE WHEN LOWER(`team_winner`) IN ('true', 'yes', '1') THEN 1 ELSE 0 END), 0),
+       COALESCE(SUM(`team_score`), 0), COALESCE(SUM(`opponent_team_score`), 0),
+       COALESCE(SUM(`total_rebounds`), 0), COALESCE(SUM(`assists`), 0), COALESCE(SUM(`steals`), 0),
+       COALESCE(SUM(`blocks`), 0), COALESCE(SUM(`turnovers`), 0), COALESCE(SUM(`field_goals_made`), 0),
+       COALESCE(SUM(`field_goals_attempted`), 0), COALESCE(SUM(`three_point_field_goals_made`), 0),
+       COALESCE(SUM(`three_point_field_goals_attempted`), 0), COALESCE(SUM(`free_throws_made`), 0),
+       COALESCE(SUM(`free_throws_attempted`), 0)
+FROM `team_box_score`
+WHERE `season` IS NOT NULL
+GROUP BY `team_id`, `season`;
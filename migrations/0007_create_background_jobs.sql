@@ -0,0 +1,20 @@
+-- Status of background jobs such as the prediction sync, shared by every worker process.
+-- `active_kind` holds the job kind while a job is queued or running; its unique index lets
+-- only one job of a kind be active across all workers.
+CREATE TABLE IF NOT EXISTS `background_jobs` (
+  `id` VARCHAR(32) NOT NULL,
+  `kind` VARCHAR(64) NOT NULL,
+  `active_kind` VARCHAR(64) NULL,
+  `status` VARCHAR(16) NOT NULL,
+  `stage` VARCHAR(32) NULL,
+  `progress` FLOAT NOT NULL,
+  `counts` JSON NULL,
+  `error` TEXT NULL,
+  `created_at` DATETIME NOT NULL,
+  `started_at` DATETIME NULL,
+  `finished_at` DATETIME NULL,
+  `updated_at` DATETIME NOT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `active_kind` (`active_kind`),
+  KEY `ix_background_jobs_kind_created_at` (`kind`, `created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
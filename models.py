@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date  # Importing Float here
+from sqlalchemy import JSON, Column, Integer, String, Float, Date, DateTime, Index, Text  # Importing Float here
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -9,20 +9,37 @@ class User(Base):
     name = Column(String(50), nullable=False)
     email = Column(String(50), unique=True, index=True)
 
+class Team(Base):
+    __tablename__ = 'teams'
+
+    team_id = Column(Integer, primary_key=True)
+    team_uid = Column(String(255), nullable=True)
+    team_slug = Column(String(255), nullable=True)
+    team_location = Column(String(255), nullable=True)
+    team_name = Column(String(255), nullable=True)
+    team_abbreviation = Column(String(255), nullable=True)
+    team_display_name = Column(String(255), nullable=True)
+    team_short_display_name = Column(String(255), nullable=True)
+    team_color = Column(String(255), nullable=True)
+    team_alternate_color = Column(String(255), nullable=True)
+    team_logo = Column(String(255), nullable=True)
+
+# Box-score id columns referencing `teams`, with the column prefix their team attributes
+# carry in uploads and exports, e.g. `team_logo` and `opponent_team_logo`
+TEAM_ID_PREFIXES = {"team_id": "team_", "opponent_team_id": "opponent_team_"}
+
 class PlayerBoxScore(Base):
     __tablename__ = 'player_box_score'
+    __table_args__ = (Index('ix_player_box_score_athlete_id_season', 'athlete_id', 'season'),)
 
-    game_id = Column(Integer, primary_key=True, index=True)
-    athlete_id = Column(Integer, primary_key=True, index=True)  # Composite primary key with `game_id`
+    game_id = Column(Integer, primary_key=True)
+    athlete_id = Column(Integer, primary_key=True)  # Composite primary key with `game_id`
     season = Column(Integer, nullable=True)
     season_type = Column(Integer, nullable=True)
-    game_date = Column(String(255), nullable=True)
-    game_date_time = Column(String(255), nullable=True)
+    game_date = Column(Date, nullable=True)
+    game_date_time = Column(DateTime, nullable=True)
     athlete_display_name = Column(String(255), nullable=True)
-    team_id = Column(Integer, nullable=True)
-    team_name = Column(String(255), nullable=True)
-    team_location = Column(String(255), nullable=True)
-    team_short_display_name = Column(String(255), nullable=True)
+    team_id = Column(Integer, nullable=True)  # Team attributes live in `teams`
     minutes = Column(Float, nullable=True)  # Now using Float, correctly imported
     field_goals_made = Column(Integer, nullable=True)
     field_goals_attempted = Column(Integer, nullable=True)
@@ -48,45 +65,22 @@ class PlayerBoxScore(Base):
     athlete_headshot_href = Column(String(255), nullable=True)
     athlete_position_name = Column(String(255), nullable=True)
     athlete_position_abbreviation = Column(String(255), nullable=True)
-    team_display_name = Column(String(255), nullable=True)
-    team_uid = Column(String(255), nullable=True)
-    team_slug = Column(String(255), nullable=True)
-    team_logo = Column(String(255), nullable=True)
-    team_abbreviation = Column(String(255), nullable=True)
-    team_color = Column(String(255), nullable=True)
-    team_alternate_color = Column(String(255), nullable=True)
     home_away = Column(String(255), nullable=True)
     team_winner = Column(String(255), nullable=True)
     team_score = Column(Integer, nullable=True)
     opponent_team_id = Column(Integer, nullable=True)
-    opponent_team_name = Column(String(255), nullable=True)
-    opponent_team_location = Column(String(255), nullable=True)
-    opponent_team_display_name = Column(String(255), nullable=True)
-    opponent_team_abbreviation = Column(String(255), nullable=True)
-    opponent_team_logo = Column(String(255), nullable=True)
-    opponent_team_color = Column(String(255), nullable=True)
-    opponent_team_alternate_color = Column(String(255), nullable=True)
     opponent_team_score = Column(Integer, nullable=True)
 
 class TeamBoxScore(Base):
     __tablename__ = 'team_box_score'
+    __table_args__ = (Index('ix_team_box_score_team_id_season', 'team_id', 'season'),)
 
-    game_id = Column(Integer, primary_key=True, index=True)
+    game_id = Column(Integer, primary_key=True)
     season = Column(Integer, nullable=True)
     season_type = Column(Integer, nullable=True)
-    game_date = Column(String(255), nullable=True)
-    game_date_time = Column(String(255), nullable=True)
-    team_id = Column(Integer, nullable=False)
-    team_uid = Column(String(255), nullable=True)
-    team_slug = Column(String(255), nullable=True)
-    team_location = Column(String(255), nullable=True)
-    team_name = Column(String(255), nullable=True)
-    team_abbreviation = Column(String(255), nullable=True)
-    team_display_name = Column(String(255), nullable=True)
-    team_short_display_name = Column(String(255), nullable=True)
-    team_color = Column(String(255), nullable=True)
-    team_alternate_color = Column(String(255), nullable=True)
-    team_logo = Column(String(255), nullable=True)
+    game_date = Column(Date, nullable=True)
+    game_date_time = Column(DateTime, nullable=True)
+    team_id = Column(Integer, nullable=False)  # Team attributes live in `teams`
     team_home_away = Column(String(255), nullable=True)
     team_score = Column(Integer, nullable=True)
     team_winner = Column(String(255), nullable=True)
@@ -117,26 +111,86 @@ class TeamBoxScore(Base):
     turnover_points = Column(Integer, nullable=True)
     turnovers = Column(Integer, nullable=True)
     opponent_team_id = Column(Integer, nullable=True)
-    opponent_team_uid = Column(String(255), nullable=True)
-    opponent_team_slug = Column(String(255), nullable=True)
-    opponent_team_location = Column(String(255), nullable=True)
-    opponent_team_name = Column(String(255), nullable=True)
-    opponent_team_abbreviation = Column(String(255), nullable=True)
-    opponent_team_display_name = Column(String(255), nullable=True)
-    opponent_team_short_display_name = Column(String(255), nullable=True)
-    opponent_team_color = Column(String(255), nullable=True)
-    opponent_team_alternate_color = Column(String(255), nullable=True)
-    opponent_team_logo = Column(String(255), nullable=True)
     opponent_team_score = Column(Integer, nullable=True)
 
 class CbbPredictions(Base):
     __tablename__ = "cbb_predictions"
-    no = Column(Integer, primary_key=True, index=True)
-    game_date = Column(Date, index=True, nullable=True)
-    game_id = Column(String(50), index=True, nullable=True)
-    away_team_full_name = Column(String(50), index=True, nullable=True)
-    home_team_full_name = Column(String(50), index=True, nullable=True)
-    prediction_alternate = Column(Float, index=True, nullable=True)
-    prediction_use = Column(Float, index=True, nullable=True)      
-    book_line = Column(Float, index=True, nullable=True)           
-    edge_v4 = Column(Float, index=True, nullable=True)             
+    # Matches the /cbbpredictions/ filters: a game_date range, then a book_line range
+    __table_args__ = (Index('ix_cbb_predictions_game_date_book_line', 'game_date', 'book_line'),)
+
+    no = Column(Integer, primary_key=True)
+    game_date = Column(Date, nullable=True)
+    game_id = Column(String(50), unique=True, index=True, nullable=True)
+    away_team_full_name = Column(String(50), nullable=True)
+    home_team_full_name = Column(String(50), nullable=True)
+    prediction_alternate = Column(Float, nullable=True)
+    prediction_use = Column(Float, nullable=True)
+    book_line = Column(Float, nullable=True)
+    edge_v4 = Column(Float, nullable=True)
+    row_hash = Column(String(64), nullable=True)  # Content fingerprint used by delta syncs
+
+class PlayerSeasonRollup(Base):
+    __tablename__ = 'player_season_rollup'
+
+    athlete_id = Column(Integer, primary_key=True)
+    season = Column(Integer, primary_key=True)  # Composite primary key with `athlete_id`
+    games = Column(Integer, nullable=False, default=0)  # Games with minutes played
+    minutes = Column(Float, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+    rebounds = Column(Integer, nullable=False, default=0)
+    assists = Column(Integer, nullable=False, default=0)
+    steals = Column(Integer, nullable=False, default=0)
+    blocks = Column(Integer, nullable=False, default=0)
+    turnovers = Column(Integer, nullable=False, default=0)
+    field_goals_made = Column(Integer, nullable=False, default=0)
+    field_goals_attempted = Column(Integer, nullable=False, default=0)
+    three_point_field_goals_made = Column(Integer, nullable=False, default=0)
+    three_point_field_goals_attempted = Column(Integer, nullable=False, default=0)
+    free_throws_made = Column(Integer, nullable=False, default=0)
+    free_throws_attempted = Column(Integer, nullable=False, default=0)
+
+class TeamSeasonRollup(Base):
+    __tablename__ = 'team_season_rollup'
+
+    team_id = Column(Integer, primary_key=True)
+    season = Column(Integer, primary_key=True)  # Composite primary key with `team_id`
+    games = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+    opponent_points = Column(Integer, nullable=False, default=0)
+    rebounds = Column(Integer, nullable=False, default=0)
+    assists = Column(Integer, nullable=False, default=0)
+    steals = Column(Integer, nullable=False, default=0)
+    blocks = Column(Integer, nullable=False, default=0)
+    turnovers = Column(Integer, nullable=False, default=0)
+    field_goals_made = Column(Integer, nullable=False, default=0)
+    field_goals_attempted = Column(Integer, nullable=False, default=0)
+    three_point_field_goals_made = Column(Integer, nullable=False, default=0)
+    three_point_field_goals_attempted = Column(Integer, nullable=False, default=0)
+    free_throws_made = Column(Integer, nullable=False, default=0)
+    free_throws_attempted = Column(Integer, nullable=False, default=0)
+
+class DataVersion(Base):
+    __tablename__ = 'data_versions'
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)  # Bumped by every write to the table
+    updated_at = Column(DateTime, nullable=True)  # UTC time of the last bump
+
+class BackgroundJob(Base):
+    __tablename__ = 'background_jobs'
+    __table_args__ = (Index('ix_background_jobs_kind_created_at', 'kind', 'created_at'),)
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(64), nullable=False)
+    # Equal to `kind` while the job is queued or running; the unique index allows one such job per kind
+    active_kind = Column(String(64), unique=True, nullable=True)
+    status = Column(String(16), nullable=False)  # queued, running, succeeded or failed
+    stage = Column(String(32), nullable=True)
+    progress = Column(Float, nullable=False, default=0)
+    counts = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)  # UTC
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False)  # Last status write, used to detect abandoned jobs
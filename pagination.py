@@ -0,0 +1,39 @@
+import base64
+import binascii
+import json
+from datetime import date
+
+from fastapi import HTTPException
+
+# Page-size cap shared by the paginated endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values):
+    """
+    Encode the sort-key values of the last row on a page into an opaque cursor.
+    """
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, date) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, length):
+    """
+    Decode a cursor produced by `encode_cursor` into its `length` sort-key values.
+    Raises a 400 error when the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != length:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # The last value is always the integer primary key tie-breaker
+    if not isinstance(values[-1], int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
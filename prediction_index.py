@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+
+from sqlalchemy import select
+
+from models import CbbPredictions, DataVersion
+
+logger = logging.getLogger(__name__)
+
+# Columns returned by the prediction endpoints
+PREDICTION_COLUMNS = [
+    CbbPredictions.no,
+    CbbPredictions.game_date,
+    CbbPredictions.game_id,
+    CbbPredictions.away_team_full_name,
+    CbbPredictions.home_team_full_name,
+    CbbPredictions.prediction_alternate,
+    CbbPredictions.prediction_use,
+    CbbPredictions.book_line,
+    CbbPredictions.edge_v4,
+]
+
+# Day number standing in for a missing game_date; sorts before every real date like NULL does
+NO_DATE = -1
+
+
+def _day(value):
+    return NO_DATE if value is None else value.toordinal()
+
+
+class PredictionSnapshot:
+    """
+    Read-only columnar copy of `cbb_predictions` sorted by (game_date, book_line, no).
+    Dates are kept as day numbers and book lines as floats (NaN for missing values) so
+    range filters become binary searches plus vectorized masks.
+    - `rows`: Rows of `PREDICTION_COLUMNS`.
+    - `version`: Data version of `cbb_predictions` the rows were read at.
+    """
+
+    def __init__(self, rows, version=0):
+        import numpy as np
+
+        days = np.array([_day(row.game_date) for row in rows], dtype=np.int32)
+        book_lines = np.array(
+            [np.nan if row.book_line is None else row.book_line for row in rows], dtype=np.float64
+        )
+        numbers = np.array([row.no for row in rows], dtype=np.int64)
+        order = np.lexsort((numbers, book_lines, days))
+
+        self.days = days[order]
+        self.book_lines = book_lines[order]
+        self.numbers = numbers[order]
+        self.records = [dict(rows[index]._mapping) for index in order]
+        self.version = version
+        self.built_at = time.time()
+
+    def __len__(self):
+        return len(self.records)
+
+    def query(self, start_date=None, end_date=None, lowest_book_line=None, highest_book_line=None,
+              after=None, limit=None):
+        """
+        Return the records matching the `/cbbpredictions/` filters in (game_date, no) order.
+        - `after`: Decoded keyset cursor `(game_date, no)`; only later records are returned.
+        - `limit`: Maximum number of records to return (default: all).
+        """
+        import numpy as np
+
+        # Binary search the date-sorted column for the candidate slice
+        lo, hi = 0, len(self.days)
+        if start_date or end_date:
+            # Date comparisons never match a missing game_date
+            lo = np.searchsorted(self.days, NO_DATE, side="right")
+        if start_date:
+            lo = max(lo, np.searchsorted(self.days, start_date.toordinal(), side="left"))
+        if end_date:
+            hi = np.searchsorted(self.days, end_date.toordinal(), side="right")
+        if after is not None:
+            lo = max(lo, np.searchsorted(self.days, _day(after[0]), side="left"))
+        if lo >= hi:
+            return []
+
+        days = self.days[lo:hi]
+        mask = np.ones(hi - lo, dtype=bool)
+        if lowest_book_line is not None:
+            mask &= self.book_lines[lo:hi] >= lowest_book_line
+        if highest_book_line is not None:
+            mask &= self.book_lines[lo:hi] <= highest_book_line
+        if after is not None:
+            after_day, after_no = _day(after[0]), after[1]
+            mask &= (days > after_day) | (self.numbers[lo:hi] > after_no)
+        matches = np.flatnonzero(mask) + lo
+
+        # Rows are grouped by date, so a page never reaches past the date of its last row
+        if limit is not None and len(matches) > limit:
+            matches = matches[self.days[matches] <= self.days[matches[limit - 1]]]
+        matches = matches[np.lexsort((self.numbers[matches], self.days[matches]))]
+        if limit is not None:
+            matches = matches[:limit]
+        return [self.records[index] for index in matches]
+
+
+class PredictionIndex:
+    """
+    Holds the current snapshot of `cbb_predictions`. A rebuild loads a complete new snapshot
+    and then swaps the reference, so readers always see either the old or the new table.
+    - `snapshot_class`: Built as `snapshot_class(rows, version)` from rows of `PREDICTION_COLUMNS`.
+    """
+
+    def __init__(self, snapshot_class=PredictionSnapshot, name="prediction index"):
+        self.snapshot_class = snapshot_class
+        self.name = name
+        self.snapshot = None
+        self._rebuild_lock = threading.Lock()
+
+    def rebuild(self, session_factory):
+        """
+        Load every prediction through a session from `session_factory` and publish a new snapshot.
+        """
+        with self._rebuild_lock:
+            started = time.perf_counter()
+            with session_factory() as db, db.begin():
+                # Read the version first: a write landing in between only makes the snapshot look older
+                version = db.scalar(
+                    select(DataVersion.version).where(DataVersion.table_name == CbbPredictions.__tablename__)
+                ) or 0
+                rows = db.execute(select(*PREDICTION_COLUMNS)).all()
+            snapshot = self.snapshot_class(rows, version)
+            self.snapshot = snapshot
+        logger.info(
+            "Rebuilt the %s with %d rows in %.3fs", self.name, len(snapshot), time.perf_counter() - started
+        )
+        return snapshot
+
+    def rebuild_in_background(self, session_factory):
+        """
+        Start a rebuild on a daemon thread unless one is already running, e.g. after
+        another worker synced new predictions.
+        """
+        if self._rebuild_lock.locked():
+            return
+        threading.Thread(target=self._rebuild_quietly, args=(session_factory,), daemon=True).start()
+
+    def _rebuild_quietly(self, session_factory):
+        try:
+            self.rebuild(session_factory)
+        except Exception:
+            logger.exception("Could not rebuild the %s", self.name)
+
+
+prediction_index = PredictionIndex()
@@ -0,0 +1,153 @@
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, inspect, text
+
+from benchmark import git_revision
+
+# Query shapes of the API, written as plain SQL that runs on the schema both before and
+# after the migrations in migrations/ (dates are compared as ISO strings)
+QUERIES = {
+    "predictions_date_book_line": (
+        "SELECT no, game_date, game_id, book_line FROM cbb_predictions "
+        "WHERE game_date BETWEEN :start AND :end AND book_line BETWEEN :low AND :high "
+        "ORDER BY game_date, no LIMIT 101",
+        {"start": "2024-12-01", "end": "2025-01-15", "low": -3.0, "high": 3.0},
+    ),
+    "player_rolling_form": (
+        "SELECT game_id, game_date, points, rebounds, assists FROM player_box_score "
+        "WHERE athlete_id = :athlete_id AND season = :season ORDER BY game_date, game_id",
+        {"athlete_id": 1000, "season": 2025},
+    ),
+    "player_rollup_groups": (
+        "SELECT DISTINCT athlete_id, season FROM player_box_score WHERE game_id IN (1, 2, 3, 4, 5, 6, 7, 8)",
+        {},
+    ),
+    "team_season_totals": (
+        "SELECT COUNT(*), SUM(team_score), SUM(opponent_team_score) FROM team_box_score "
+        "WHERE team_id = :team_id AND season = :season",
+        {"team_id": 1, "season": 2025},
+    ),
+    "player_date_range": (
+        "SELECT COUNT(*), SUM(points) FROM player_box_score WHERE game_date BETWEEN :start AND :end",
+        {"start": "2024-12-01", "end": "2024-12-31"},
+    ),
+}
+
+EXPLAIN_PREFIX = {
+    "mysql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+
+def explain(connection, sql, params):
+    """
+    Return the query plan of `sql` as a list of row dictionaries.
+    """
+    prefix = EXPLAIN_PREFIX.get(connection.dialect.name, "EXPLAIN ")
+    return [
+        {key: value for key, value in row._mapping.items()}
+        for row in connection.execute(text(prefix + sql), params)
+    ]
+
+
+def time_query(connection, sql, params, repeat):
+    """
+    Run `sql` `repeat` times and return the median and best latency in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        connection.execute(text(sql), params).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(statistics.median(timings), 3), "min_ms": round(min(timings), 3)}
+
+
+def table_stats(connection):
+    """
+    Row counts, plus data and index sizes on MySQL, of the tables touched by the queries.
+    """
+    stats = {}
+    for table_name in ("cbb_predictions", "player_box_score", "team_box_score"):
+        table_stats = {"rows": connection.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()}
+        if connection.dialect.name == "mysql":
+            sizes = connection.execute(
+                text(
+                    "SELECT data_length, index_length FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name = :table_name"
+                ),
+                {"table_name": table_name},
+            ).first()
+            table_stats.update(data_bytes=sizes[0], index_bytes=sizes[1])
+        table_stats["indexes"] = sorted(index["name"] for index in inspect(connection).get_indexes(table_name))
+        stats[table_name] = table_stats
+    return stats
+
+
+def run(database_url, repeat):
+    engine = create_engine(database_url)
+    results = {}
+    with engine.connect() as connection:
+        tables = table_stats(connection)
+        for name, (sql, params) in QUERIES.items():
+            # One untimed run warms the buffer pool / page cache
+            connection.execute(text(sql), params).all()
+            results[name] = {"plan": explain(connection, sql, params), **time_query(connection, sql, params, repeat)}
+            print(f"{name:30s} median {results[name]['median_ms']:>9.3f} ms  min {results[name]['min_ms']:>9.3f} ms")
+    return {"tables": tables, "queries": results}
+
+
+def compare(before_path, after_path):
+    """
+    Print the latency change of every query between two result files.
+    """
+    with open(before_path) as before_file, open(after_path) as after_file:
+        before, after = json.load(before_file), json.load(after_file)
+    print(f"{'query':30s} {'before ms':>10s} {'after ms':>10s} {'speedup':>8s}")
+    for name, after_result in after["queries"].items():
+        before_result = before["queries"].get(name)
+        if before_result is None:
+            continue
+        speedup = before_result["median_ms"] / after_result["median_ms"] if after_result["median_ms"] else float("inf")
+        print(f"{name:30s} {before_result['median_ms']:>10.3f} {after_result['median_ms']:>10.3f} {speedup:>7.2f}x")
+    for table_name, after_stats in after["tables"].items():
+        before_stats = before["tables"].get(table_name, {})
+        print(f"{table_name}: indexes {before_stats.get('indexes')} -> {after_stats['indexes']}")
+        if "data_bytes" in after_stats and "data_bytes" in before_stats:
+            print(f"{table_name}: data {before_stats['data_bytes']} -> {after_stats['data_bytes']} bytes, "
+                  f"indexes {before_stats['index_bytes']} -> {after_stats['index_bytes']} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record query plans and timings of the API's query shapes, e.g. before and after "
+                    "`python manage.py migrate`, and compare two recordings."
+    )
+    parser.add_argument("--database-url", help="Database to inspect")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per query")
+    parser.add_argument("--output", default="query_plans.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if not args.database_url:
+        parser.error("--database-url is required unless --compare is given")
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "repeat": args.repeat,
+        **run(args.database_url, args.repeat),
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2, default=str)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
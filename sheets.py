@@ -0,0 +1,213 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+# If modifying these scopes, delete the file token.json.
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+
+# The ID and range of the predictions spreadsheet.
+SAMPLE_SPREADSHEET_ID = "1zVJZjqTlAbDUAXBisTlcs5XBoocm4lHen3t0hWt5SEA"
+SAMPLE_RANGE_NAME = "predictions"  # Specify the entire sheet by its name
+
+# Sheet columns kept by the prediction sync, as (first, last) column letters:
+# date, game_id, teams and the two predictions (A-F), then book line and edge (J-K)
+PREDICTION_COLUMN_RANGES = [("A", "F"), ("J", "K")]
+
+# Sheet rows requested per batchGet call when fetching predictions in chunks
+PREDICTION_CHUNK_ROWS = 5000
+
+# Refresh the OAuth token when it is this close to expiring
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+
+class SheetsClient:
+    """
+    Google Sheets client that builds the API service once and keeps OAuth
+    credentials in memory, refreshing them only when they are about to expire.
+    - `token_file`: Cached user token, rewritten only when the token changes.
+    - `credentials_file`: OAuth client secrets used for the first login.
+    - `http`: Optional httplib2-compatible transport. When given, no credentials are
+      loaded and every request goes through it, e.g. a local fake sheet in tests.
+    """
+
+    def __init__(self, token_file="token.json", credentials_file="credentials.json", scopes=SCOPES, http=None):
+        self.token_file = token_file
+        self.credentials_file = credentials_file
+        self.scopes = scopes
+        self._http = http
+        self._creds = None
+        self._saved_token = None
+        self._service = None
+        # googleapiclient services are not thread-safe, so calls are serialized
+        self._lock = threading.Lock()
+
+    def _expires_soon(self, creds):
+        if not creds.expiry:
+            return False
+        now = datetime.now(timezone.utc).replace(tzinfo=None)  # google-auth uses naive UTC
+        return creds.expiry - TOKEN_REFRESH_MARGIN <= now
+
+    def _save_token(self):
+        token = self._creds.to_json()
+        if token != self._saved_token:
+            with open(self.token_file, "w") as token_file:
+                token_file.write(token)
+            self._saved_token = token
+
+    def _ensure_credentials(self):
+        """
+        Load credentials once, refresh them near expiry and prompt for login only
+        when no usable token is available.
+        """
+        # The Google client libraries are slow to import, so load them on first use
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        if self._creds is None and os.path.exists(self.token_file):
+            self._creds = Credentials.from_authorized_user_file(self.token_file, self.scopes)
+            self._saved_token = self._creds.to_json()
+
+        creds = self._creds
+        if creds and creds.valid and not self._expires_soon(creds):
+            return creds
+
+        if creds and creds.refresh_token:
+            # Refreshing mutates the credentials the built service already holds
+            creds.refresh(Request())
+        else:
+            flow = InstalledAppFlow.from_client_secrets_file(self.credentials_file, self.scopes)
+            self._creds = flow.run_local_server(port=0)
+            self._service = None
+        self._save_token()
+        return self._creds
+
+    def _get_service(self):
+        from googleapiclient.discovery import build
+
+        if self._http is not None:
+            if self._service is None:
+                self._service = build("sheets", "v4", http=self._http, cache_discovery=False)
+            return self._service
+
+        creds = self._ensure_credentials()
+        if self._service is None:
+            self._service = build("sheets", "v4", credentials=creds, cache_discovery=False)
+        return self._service
+
+    def get_values(self, spreadsheet_id, range_name, **params):
+        """
+        Fetch the cell values of `range_name`, returning an empty list when the range is empty.
+        Raises `googleapiclient.errors.HttpError` when the API call fails.
+        """
+        with self._lock:
+            service = self._get_service()
+            result = (
+                service.spreadsheets()
+                .values()
+                .get(spreadsheetId=spreadsheet_id, range=range_name, **params)
+                .execute()
+            )
+        return result.get("values", [])
+
+    def batch_get_values(self, spreadsheet_id, ranges, **params):
+        """
+        Fetch several ranges in one request, returning one list of rows per range.
+        Raises `googleapiclient.errors.HttpError` when the API call fails.
+        """
+        with self._lock:
+            service = self._get_service()
+            result = (
+                service.spreadsheets()
+                .values()
+                .batchGet(spreadsheetId=spreadsheet_id, ranges=ranges, **params)
+                .execute()
+            )
+        return [value_range.get("values", []) for value_range in result.get("valueRanges", [])]
+
+    def get_row_count(self, spreadsheet_id, sheet_name):
+        """
+        Return the number of rows in the grid of the tab `sheet_name`, blank rows included.
+        Raises `googleapiclient.errors.HttpError` when the API call fails.
+        """
+        with self._lock:
+            service = self._get_service()
+            result = (
+                service.spreadsheets()
+                .get(
+                    spreadsheetId=spreadsheet_id,
+                    ranges=[sheet_name],
+                    fields="sheets.properties.gridProperties.rowCount",
+                )
+                .execute()
+            )
+        return result["sheets"][0]["properties"]["gridProperties"]["rowCount"]
+
+
+def _pad(row, width):
+    return list(row) + [""] * (width - len(row))
+
+
+def iter_prediction_rows(
+    client=None,
+    spreadsheet_id=SAMPLE_SPREADSHEET_ID,
+    sheet_name=SAMPLE_RANGE_NAME,
+    chunk_rows=PREDICTION_CHUNK_ROWS,
+    progress=None,
+):
+    """
+    Fetch only the prediction columns of the sheet, `chunk_rows` rows per request, and
+    yield each chunk as a list of rows laid out like `fetch_predictions_from_sheets`.
+    Values are requested unformatted, so numbers arrive as numbers and dates as
+    spreadsheet serial day numbers. The header row is skipped.
+    The grid's row count is read first: the API drops trailing blank rows from every range,
+    so a short or empty chunk does not mean the data has ended.
+    - `progress`: Optional callback receiving (rows fetched, rows in the grid) after each chunk.
+    """
+    client = client or get_sheets_client()
+    row_count = client.get_row_count(spreadsheet_id, sheet_name)
+    widths = [ord(last) - ord(first) + 1 for first, last in PREDICTION_COLUMN_RANGES]
+    start = 2  # Row 1 holds the headers
+    while start <= row_count:
+        end = min(start + chunk_rows - 1, row_count)
+        ranges = [f"{sheet_name}!{first}{start}:{last}{end}" for first, last in PREDICTION_COLUMN_RANGES]
+        parts = client.batch_get_values(
+            spreadsheet_id,
+            ranges,
+            valueRenderOption="UNFORMATTED_VALUE",
+            dateTimeRenderOption="SERIAL_NUMBER",
+        )
+        # The API drops trailing empty rows, so the ranges can come back with different lengths
+        num_rows = max((len(rows) for rows in parts), default=0)
+        if num_rows:
+            yield [
+                [value for rows, width in zip(parts, widths) for value in _pad(rows[i] if i < len(rows) else [], width)]
+                for i in range(num_rows)
+            ]
+        if progress is not None:
+            progress(end - 1, row_count - 1)
+        start = end + 1
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_sheets_client():
+    """
+    Return the process-wide Sheets client, creating it on first use.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SheetsClient()
+        return _client
+
+
+def set_sheets_client(client):
+    """
+    Replace the process-wide Sheets client, e.g. with one backed by a fake transport.
+    """
+    global _client
+    with _client_lock:
+        _client = client
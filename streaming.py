@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from datetime import date
+
+from fastapi import HTTPException
+
+# Response formats selectable through `format` or the Accept header
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Rows fetched from the server-side cursor and encoded per response chunk
+STREAM_BATCH_SIZE = 1000
+
+
+def negotiate_format(format, accept):
+    """
+    Pick the response format from an explicit `format` parameter or the Accept header.
+    Returns `json` when neither asks for a streaming format.
+    """
+    if format:
+        if format != "json" and format not in STREAM_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'")
+        return format
+    for media_range in (accept or "").split(","):
+        media_type = media_range.split(";")[0].strip().lower()
+        for name, stream_media_type in STREAM_MEDIA_TYPES.items():
+            if media_type == stream_media_type:
+                return name
+    return "json"
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_ndjson(columns, rows):
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_json_default) + "\n" for row in rows
+    )
+
+
+def _encode_csv(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_rows(session_factory, query, format, batch_size=STREAM_BATCH_SIZE):
+    """
+    Execute a column-level `query` on a server-side cursor and yield the rows encoded
+    as NDJSON or CSV, one chunk per `batch_size` rows.
+    The generator opens its own session because request dependencies are closed
+    before a streaming response body is sent.
+    """
+    async with session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        columns = list(result.keys())
+        if format == "csv":
+            yield _encode_csv([columns])
+        async for rows in result.partitions():
+            if format == "csv":
+                yield _encode_csv(rows)
+            else:
+                yield _encode_ndjson(columns, rows)
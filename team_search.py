@@ -0,0 +1,115 @@
+import bisect
+import difflib
+import re
+import unicodedata
+
+from prediction_index import NO_DATE, PredictionIndex
+
+# Minimum difflib similarity (0-1) for a fuzzy team-name match
+FUZZY_CUTOFF = 0.75
+
+# Most team names a single fuzzy lookup may add
+FUZZY_MATCHES = 10
+
+
+def normalize_name(name):
+    """
+    Fold a team name for matching: strip accents and apostrophes, casefold and reduce other
+    punctuation to single spaces, so "St. John's" becomes "st johns".
+    """
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char) and char not in "'\u2019")
+    return " ".join(re.split(r"[\W_]+", stripped.casefold())).strip()
+
+
+def _sort_key(record):
+    game_date = record["game_date"]
+    return (NO_DATE if game_date is None else game_date.toordinal(), record["no"])
+
+
+class TeamSearchSnapshot:
+    """
+    Read-only team-name index over `cbb_predictions`.
+    Every word suffix of every normalized away/home team name ("st johns", "johns") is kept
+    in a sorted array, so a prefix lookup is a binary search plus a short forward scan.
+    - `rows`: Rows of `PREDICTION_COLUMNS`.
+    - `version`: Data version of `cbb_predictions` the rows were read at.
+    """
+
+    def __init__(self, rows, version=0):
+        self.records = sorted((dict(row._mapping) for row in rows), key=_sort_key)
+        self.sort_keys = [_sort_key(record) for record in self.records]
+        self.version = version
+
+        # Normalized name -> id, with the positions of the records that mention it
+        self.names = []
+        self.display_names = []
+        self.positions = []
+        self.name_ids = name_ids = {}
+        for position, record in enumerate(self.records):
+            for team_name in (record["away_team_full_name"], record["home_team_full_name"]):
+                normalized = normalize_name(team_name)
+                if not normalized:
+                    continue
+                name_id = name_ids.get(normalized)
+                if name_id is None:
+                    name_id = name_ids[normalized] = len(self.names)
+                    self.names.append(normalized)
+                    self.display_names.append(team_name)
+                    self.positions.append([])
+                if not self.positions[name_id] or self.positions[name_id][-1] != position:
+                    self.positions[name_id].append(position)
+
+        self.keys = sorted(
+            (normalized[match.start():], name_id)
+            for name_id, normalized in enumerate(self.names)
+            for match in re.finditer(r"\S+", normalized)
+        )
+        self.words = {}
+        for name_id, normalized in enumerate(self.names):
+            for word in normalized.split():
+                self.words.setdefault(word, set()).add(name_id)
+
+    def __len__(self):
+        return len(self.records)
+
+    def match(self, query, fuzzy=False):
+        """
+        Return the ids of the team names with a word starting with the normalized `query`;
+        with `fuzzy`, also names or words within `FUZZY_CUTOFF` similarity of it.
+        """
+        query = normalize_name(query)
+        if not query:
+            return []
+        matches = set()
+        index = bisect.bisect_left(self.keys, (query,))
+        while index < len(self.keys) and self.keys[index][0].startswith(query):
+            matches.add(self.keys[index][1])
+            index += 1
+
+        if fuzzy:
+            for name in difflib.get_close_matches(query, self.name_ids, FUZZY_MATCHES, FUZZY_CUTOFF):
+                matches.add(self.name_ids[name])
+            for word in difflib.get_close_matches(query, self.words, FUZZY_MATCHES, FUZZY_CUTOFF):
+                matches.update(self.words[word])
+        return sorted(matches)
+
+    def search(self, query, fuzzy=False, after=None, limit=None):
+        """
+        Return `(team names, records)` for `query`, with the records of every matching team
+        in (game_date, no) order.
+        - `after`: Decoded keyset cursor `(game_date, no)`; only later records are returned.
+        - `limit`: Maximum number of records to return (default: all).
+        """
+        name_ids = self.match(query, fuzzy)
+        positions = sorted({position for name_id in name_ids for position in self.positions[name_id]})
+        if after is not None:
+            after_key = (NO_DATE if after[0] is None else after[0].toordinal(), after[1])
+            first = bisect.bisect_right(self.sort_keys, after_key)
+            positions = positions[bisect.bisect_left(positions, first):]
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.display_names[name_id] for name_id in name_ids], [self.records[index] for index in positions]
+
+
+team_search_index = PredictionIndex(TeamSearchSnapshot, "team search index")
@@ -0,0 +1,34 @@
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# database.py builds its engines on import; point them at a throwaway SQLite file instead of MySQL
+_scratch = os.path.join(tempfile.mkdtemp(prefix="cbb-tests-"), "app.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch}")
+os.environ.setdefault("ASYNC_DATABASE_URL", f"sqlite+aiosqlite:///{_scratch}")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    Session factory bound to a fresh SQLite database holding every table in models.py.
+    """
+    from models import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        yield session
@@ -0,0 +1,72 @@
+from sqlalchemy import select
+
+from ingest import upsert_predictions
+from models import CbbPredictions, DataVersion
+
+
+def sheet_row(game_id, book_line="3.5", edge="0.1", day=1):
+    return [f"2025-01-{day:02d}", str(game_id), "Away", "Home", "70.5", "71.0", book_line, edge]
+
+
+def stored(db):
+    return {row.game_id: row for row in db.execute(select(CbbPredictions)).scalars()}
+
+
+def data_version(db):
+    return db.scalar(select(DataVersion.version).where(DataVersion.table_name == "cbb_predictions")) or 0
+
+
+def test_inserts_then_leaves_unchanged_rows_alone(db):
+    rows = [sheet_row(game_id) for game_id in range(1, 5)]
+    assert upsert_predictions(db, rows) == {
+        "inserted": 4, "updated": 0, "unchanged": 0, "skipped": 0, "deleted": 0,
+    }
+    version = data_version(db)
+
+    assert upsert_predictions(db, rows)["unchanged"] == 4
+    assert data_version(db) == version
+
+
+def test_updates_changed_rows_and_rewrites_everything_when_forced(db):
+    upsert_predictions(db, [sheet_row(1), sheet_row(2)])
+
+    counts = upsert_predictions(db, [sheet_row(1, book_line="-2.5"), sheet_row(2)])
+    assert (counts["updated"], counts["unchanged"]) == (1, 1)
+    assert stored(db)["1"].book_line == -2.5
+
+    counts = upsert_predictions(db, [sheet_row(1, book_line="-2.5"), sheet_row(2)], force=True)
+    assert (counts["updated"], counts["unchanged"]) == (2, 0)
+
+
+def test_delete_missing_keeps_rows_that_fail_to_parse(db):
+    upsert_predictions(db, [sheet_row(game_id) for game_id in range(1, 5)])
+
+    rows = [
+        sheet_row(1),
+        sheet_row(2, book_line="PK"),  # Unparsable value
+        sheet_row(3)[:5],  # Cut short, like a row with trailing empty cells
+    ]
+    counts = upsert_predictions(db, rows, delete_missing=True)
+
+    assert (counts["skipped"], counts["deleted"]) == (2, 1)
+    assert sorted(stored(db)) == ["1", "2", "3"]
+    assert stored(db)["2"].book_line == 3.5
+
+
+def test_later_duplicates_of_a_game_id_are_skipped(db):
+    counts = upsert_predictions(db, [sheet_row(1, book_line="1.0"), sheet_row(1, book_line="9.0")])
+
+    assert (counts["inserted"], counts["skipped"]) == (1, 1)
+    assert stored(db)["1"].book_line == 1.0
+
+
+def test_streams_rows_in_committed_batches(db):
+    reports = []
+    rows = (sheet_row(game_id, day=game_id % 28 + 1) for game_id in range(1, 8))
+
+    counts = upsert_predictions(db, rows, batch_size=3, progress=lambda done, total: reports.append((done, total)))
+
+    assert counts["inserted"] == 7
+    assert len(stored(db)) == 7
+    assert reports == [(3, None), (6, None), (7, None)]
+    assert data_version(db) == 3  # One bump per written batch
@@ -0,0 +1,71 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from main import decode_prediction_cursor, filter_predictions
+from models import CbbPredictions
+from pagination import encode_cursor
+from prediction_index import PREDICTION_COLUMNS, PredictionSnapshot
+
+FILTERS = [
+    {},
+    {"start_date": date(2025, 1, 5), "end_date": date(2025, 1, 20)},
+    {"lowest_book_line": -3.0, "highest_book_line": 3.0},
+    {"start_date": date(2025, 1, 10), "lowest_book_line": 0.0},
+    {"end_date": date(2025, 1, 3)},
+]
+
+
+@pytest.fixture
+def predictions(db):
+    """
+    Seed predictions with repeated dates and some NULL game_date and book_line values.
+    """
+    rng = random.Random(7)
+    rows = []
+    for index in range(300):
+        rows.append({
+            "game_id": str(index),
+            "game_date": None if rng.random() < 0.1 else date(2025, 1, 1) + timedelta(days=rng.randrange(30)),
+            "away_team_full_name": "Away",
+            "home_team_full_name": "Home",
+            "book_line": None if rng.random() < 0.1 else rng.randrange(-20, 21) / 2,
+        })
+    db.execute(insert(CbbPredictions), rows)
+    db.commit()
+    return db.execute(select(*PREDICTION_COLUMNS)).all()
+
+
+def page_through(fetch_page, limit):
+    """
+    Follow next cursors from the first page and return every page's game_ids.
+    """
+    pages, cursor = [], None
+    while True:
+        rows = fetch_page(cursor, limit + 1)
+        pages.append([row["game_id"] for row in rows[:limit]])
+        if len(rows) <= limit:
+            return pages
+        last = rows[limit - 1]
+        cursor = encode_cursor([last["game_date"], last["no"]])
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("limit", [1, 7, 50, 1000])
+def test_snapshot_pages_match_the_sql_keyset_path(db, predictions, filters, limit):
+    snapshot = PredictionSnapshot(predictions)
+    arguments = [filters.get(name) for name in ("start_date", "end_date", "lowest_book_line", "highest_book_line")]
+
+    def sql_page(cursor, page_limit):
+        query = filter_predictions(select(*PREDICTION_COLUMNS), *arguments, cursor).limit(page_limit)
+        return [dict(row._mapping) for row in db.execute(query)]
+
+    def snapshot_page(cursor, page_limit):
+        after = decode_prediction_cursor(cursor) if cursor else None
+        return snapshot.query(*arguments, after, page_limit)
+
+    expected = page_through(sql_page, limit)
+    assert page_through(snapshot_page, limit) == expected
+    assert sum(len(page) for page in expected) > 0
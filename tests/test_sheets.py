@@ -0,0 +1,62 @@
+from benchmark import FakeSheetHttp, build_sheet_values
+from sheets import SheetsClient, iter_prediction_rows
+
+
+class TrimmingSheetHttp(FakeSheetHttp):
+    """
+    Fake sheet that drops trailing blank rows from every range, as the Sheets API does.
+    """
+
+    def _value_range(self, range_name):
+        value_range = super()._value_range(range_name)
+        rows = value_range["values"]
+        while rows and not any(rows[-1]):
+            rows.pop()
+        return value_range
+
+
+def fetch(values, chunk_rows, progress=None):
+    client = SheetsClient(http=TrimmingSheetHttp(values))
+    return list(iter_prediction_rows(client, chunk_rows=chunk_rows, progress=progress))
+
+
+def test_returns_every_row_without_the_header():
+    values = build_sheet_values(10, seed=0)
+
+    rows = [row for chunk in fetch(values, chunk_rows=4) for row in chunk]
+
+    assert [row[1] for row in rows] == [row[1] for row in values[1:]]
+    assert all(len(row) == 8 for row in rows)
+    assert rows[0][6:] == values[1][9:11]  # Book line and edge come from columns J-K
+
+
+def test_keeps_reading_past_blank_rows_that_end_a_chunk():
+    values = build_sheet_values(12, seed=0)
+    for index in range(3, 9):
+        values[index] = [""] * len(values[index])
+
+    rows = [row for chunk in fetch(values, chunk_rows=3) for row in chunk]
+
+    game_ids = [row[1] for row in rows if row[1]]
+    assert game_ids == [row[1] for row in values[1:] if row[1]]
+    assert game_ids[-1] == values[-1][1]
+
+
+def test_short_rows_are_padded_to_every_column():
+    values = build_sheet_values(3, seed=0)
+    values[2] = values[2][:2]  # Only the date and game_id are filled in
+
+    rows = [row for chunk in fetch(values, chunk_rows=10) for row in chunk]
+
+    assert rows[1] == [values[2][0], values[2][1], "", "", "", "", "", ""]
+
+
+def test_reports_progress_against_the_grid_row_count():
+    reports = []
+    fetch(build_sheet_values(10, seed=0), chunk_rows=4, progress=lambda done, total: reports.append((done, total)))
+
+    assert reports == [(4, 10), (8, 10), (10, 10)]
+
+
+def test_an_empty_sheet_yields_nothing():
+    assert fetch(build_sheet_values(0, seed=0), chunk_rows=5) == []
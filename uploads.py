@@ -0,0 +1,275 @@
+import codecs
+import csv
+import json
+from datetime import date, datetime, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import Date, DateTime, Float, Integer, String
+
+from database import build_insert_ignore, build_upsert
+from models import TEAM_ID_PREFIXES, PlayerBoxScore, Team, TeamBoxScore
+
+# Tables accepted by the upload endpoint; rows are upserted on their primary key
+UPLOAD_MODELS = {
+    "player_box_score": PlayerBoxScore,  # (game_id, athlete_id)
+    "team_box_score": TeamBoxScore,  # game_id
+}
+
+UPLOAD_FORMATS = {
+    "ndjson": ("ndjson", "jsonl", "json"),
+    "csv": ("csv",),
+}
+
+# Rows written and committed per batch
+BATCH_SIZE = 1000
+
+# Rejected rows reported in detail; later rejects are only counted
+MAX_REJECTS = 100
+
+
+def upload_format(format, content_type):
+    """
+    Pick `ndjson` or `csv` from an explicit `format` parameter or the request Content-Type.
+    """
+    if format:
+        if format not in UPLOAD_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'")
+        return format
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    for name, markers in UPLOAD_FORMATS.items():
+        if any(media_type.endswith(marker) for marker in markers):
+            return name
+    raise HTTPException(status_code=415, detail="Send application/x-ndjson or text/csv")
+
+
+def _integer(value):
+    if isinstance(value, bool):
+        raise ValueError(f"{value!r} is not an integer")
+    if isinstance(value, str):
+        value = value.strip()
+        value = int(value) if value.lstrip("+-").isdigit() else float(value)
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"{value!r} is not an integer")
+        value = int(value)
+    return int(value)
+
+
+def _float(value):
+    if isinstance(value, bool):
+        raise ValueError(f"{value!r} is not a number")
+    return float(value)
+
+
+def _date(value):
+    return date.fromisoformat(str(value)[:10])
+
+
+def _datetime(value):
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        # DateTime columns hold naive UTC
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _string(length):
+    def coerce(value):
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif not isinstance(value, str):
+            value = str(value)
+        if length and len(value) > length:
+            raise ValueError(f"longer than {length} characters")
+        return value
+    return coerce
+
+
+def column_coercers(model):
+    """
+    Map every column of `model` to a function converting a CSV or JSON value to the column type.
+    """
+    coercers = {}
+    for column in model.__table__.c:
+        if isinstance(column.type, Integer):
+            coercers[column.name] = _integer
+        elif isinstance(column.type, Float):
+            coercers[column.name] = _float
+        elif isinstance(column.type, DateTime):
+            coercers[column.name] = _datetime
+        elif isinstance(column.type, Date):
+            coercers[column.name] = _date
+        elif isinstance(column.type, String):
+            coercers[column.name] = _string(column.type.length)
+        else:
+            coercers[column.name] = lambda value: value
+    return coercers
+
+
+async def iter_lines(chunks):
+    """
+    Decode an async stream of UTF-8 byte chunks into numbered lines as they arrive.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield line_number + 1, buffer.rstrip("\r")
+
+
+async def iter_records(lines, format):
+    """
+    Turn numbered lines into `(line number, dict or error message)` pairs.
+    CSV input needs a header line and one record per line (no newlines inside quoted fields).
+    """
+    header = None
+    async for line_number, line in lines:
+        if not line.strip():
+            continue
+        if format == "ndjson":
+            try:
+                record = json.loads(line)
+            except ValueError as err:
+                yield line_number, f"invalid JSON: {err}"
+                continue
+            yield line_number, record if isinstance(record, dict) else "expected a JSON object"
+        elif header is None:
+            header = next(csv.reader([line]))
+        else:
+            values = next(csv.reader([line]))
+            if len(values) != len(header):
+                yield line_number, f"expected {len(header)} fields, got {len(values)}"
+                continue
+            # `\N` marks NULL, as in the files written by `utils.write_csv`
+            yield line_number, {name: None if value == "\\N" else value for name, value in zip(header, values)}
+
+
+class BoxScoreUpload:
+    """
+    Validates uploaded records against a box-score model and collects them into batches.
+    Team and opponent attributes (`team_name`, `opponent_team_logo`, ...) are collected per
+    team id and upserted into `teams` with each batch.
+    - `model`: `PlayerBoxScore` or `TeamBoxScore`.
+    """
+
+    def __init__(self, model, batch_size=BATCH_SIZE):
+        self.table = model.__table__
+        self.coercers = column_coercers(model)
+        self.key_columns = [column.name for column in self.table.primary_key.columns]
+        self.required = [column.name for column in self.table.c if not column.nullable]
+        self.batch_size = batch_size
+        self.batch = {}
+        self.game_ids = set()
+
+        # Uploaded column -> (box-score id column, `teams` column)
+        self.team_coercers = column_coercers(Team)
+        self.team_columns = {}
+        for id_column, prefix in TEAM_ID_PREFIXES.items():
+            if id_column not in self.coercers:
+                continue
+            for name in self.team_coercers:
+                upload_name = prefix + name.removeprefix("team_")
+                if name != "team_id" and upload_name not in self.coercers:
+                    self.team_columns[upload_name] = (id_column, name)
+        self.teams = {}  # team_id -> attributes queued for the next batch
+        self.team_ids = set()
+        self.ignored_columns = set()
+        self.counts = {"received": 0, "written": 0, "rejected": 0}
+        self.rejects = []
+
+    def reject(self, line_number, errors):
+        self.counts["rejected"] += 1
+        if len(self.rejects) < MAX_REJECTS:
+            self.rejects.append({"line": line_number, "errors": errors})
+
+    def add(self, line_number, record):
+        """
+        Validate one record and queue it for the next batch.
+        Columns missing from the record are stored as NULL; unknown columns are ignored.
+        Returns True when a full batch is ready to be written.
+        """
+        self.counts["received"] += 1
+        if isinstance(record, str):
+            self.reject(line_number, [record])
+            return False
+
+        row = dict.fromkeys(self.coercers)
+        team_attributes = {id_column: {} for id_column in TEAM_ID_PREFIXES}
+        errors = []
+        for name, value in record.items():
+            coerce = self.coercers.get(name)
+            team_column = self.team_columns.get(name)
+            if coerce is None and team_column is None:
+                self.ignored_columns.add(name)
+            elif value is not None and value != "":
+                try:
+                    if coerce is not None:
+                        row[name] = coerce(value)
+                    else:
+                        id_column, attribute = team_column
+                        team_attributes[id_column][attribute] = self.team_coercers[attribute](value)
+                except (TypeError, ValueError, OverflowError) as err:
+                    errors.append(f"{name}: {err}")
+        errors.extend(f"{name}: required" for name in self.required if row[name] is None)
+        if errors:
+            self.reject(line_number, errors)
+            return False
+
+        # Attributes without a team id cannot be stored; missing attributes keep their stored value
+        for id_column, attributes in team_attributes.items():
+            team_id = row.get(id_column)
+            if team_id is not None:
+                self.teams.setdefault(team_id, {}).update(attributes)
+
+        # A later row with the same key replaces an earlier one in the batch
+        self.batch[tuple(row[name] for name in self.key_columns)] = row
+        return len(self.batch) >= self.batch_size
+
+    def write_batch(self, db):
+        """
+        Upsert the queued rows and their teams, then commit; `db` is a sync session.
+        """
+        if not self.batch:
+            return
+        rows = list(self.batch.values())
+        dialect_name = db.get_bind().dialect.name
+        update_columns = [name for name in self.coercers if name not in self.key_columns]
+        # One compiled statement executed for all rows; drivers send them as multi-row batches
+        db.execute(build_upsert(dialect_name, self.table, None, self.key_columns, update_columns), rows)
+        self.write_teams(db, dialect_name)
+        db.commit()
+        self.counts["written"] += len(rows)
+        self.game_ids.update(row["game_id"] for row in rows)
+        self.batch = {}
+
+    def write_teams(self, db, dialect_name):
+        """
+        Add the queued teams to `teams`, overwriting only the attributes that were uploaded.
+        """
+        table = Team.__table__
+        groups = {}
+        for team_id, attributes in sorted(self.teams.items()):
+            groups.setdefault(tuple(sorted(attributes)), []).append({"team_id": team_id, **attributes})
+        for names, rows in groups.items():
+            if names:
+                db.execute(build_upsert(dialect_name, table, None, ["team_id"], list(names)), rows)
+            else:
+                db.execute(build_insert_ignore(dialect_name, table, rows))
+        self.team_ids.update(self.teams)
+        self.teams = {}
+
+    def summary(self):
+        return {
+            **self.counts,
+            "games": len(self.game_ids),
+            "teams": len(self.team_ids),
+            "ignored_columns": sorted(self.ignored_columns),
+            "rejects": self.rejects,
+        }
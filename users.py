@@ -0,0 +1,93 @@
+import json
+
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import select
+
+from caching import bump_data_version
+from database import build_insert_ignore
+from models import User
+
+# Number of users written per INSERT statement
+BATCH_SIZE = 1000
+
+
+class UserCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=50)
+    email: str = Field(min_length=3, max_length=50)
+
+
+def parse_user_items(body, content_type):
+    """
+    Parse a bulk request body holding a JSON array or NDJSON lines of users.
+    Returns a list of `UserCreate` objects or per-item error dictionaries.
+    Raises ValueError when the body itself is malformed.
+    """
+    if "ndjson" in (content_type or ""):
+        raw_items = [json.loads(line) for line in body.splitlines() if line.strip()]
+    else:
+        raw_items = json.loads(body)
+        if not isinstance(raw_items, list):
+            raise ValueError("Expected a JSON array of users")
+
+    items = []
+    for raw_item in raw_items:
+        try:
+            items.append(UserCreate.model_validate(raw_item))
+        except ValidationError as err:
+            items.append({"errors": [error["msg"] for error in err.errors()]})
+    return items
+
+
+def bulk_create_users(db, items, batch_size=BATCH_SIZE):
+    """
+    Insert users in batched statements, letting the unique index on `email` reject duplicates.
+    - `items`: Output of `parse_user_items`, in request order.
+    Returns one result per item with the new id, a conflict marker or validation errors.
+    """
+    results = [None] * len(items)
+    seen_emails = set()
+    pending = []
+    for index, item in enumerate(items):
+        if isinstance(item, dict):
+            results[index] = {"index": index, "status": "invalid", **item}
+        elif item.email in seen_emails:
+            results[index] = {"index": index, "email": item.email, "status": "conflict"}
+        else:
+            seen_emails.add(item.email)
+            pending.append((index, item))
+
+    dialect = db.get_bind().dialect
+    table = User.__table__
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        rows = [{"name": item.name, "email": item.email} for _, item in batch]
+
+        if dialect.insert_returning:
+            # Rows skipped by the unique index are simply missing from RETURNING
+            stmt = build_insert_ignore(dialect.name, table, rows).returning(table.c.id, table.c.email)
+            created = dict((email, user_id) for user_id, email in db.execute(stmt))
+        else:
+            # MySQL has no RETURNING: note pre-existing emails, insert the rest, then read back ids.
+            # The locking read takes next-key locks on these emails, so a concurrent insert of one
+            # of them waits for this transaction to commit instead of slipping in between.
+            emails = [row["email"] for row in rows]
+            existing = set(
+                db.scalars(select(table.c.email).where(table.c.email.in_(emails)).with_for_update())
+            )
+            db.execute(build_insert_ignore(dialect.name, table, rows))
+            fresh = [email for email in emails if email not in existing]
+            created = dict(
+                (email, user_id)
+                for user_id, email in db.execute(select(table.c.id, table.c.email).where(table.c.email.in_(fresh)))
+            ) if fresh else {}
+
+        for index, item in batch:
+            if item.email in created:
+                results[index] = {"index": index, "email": item.email, "status": "created", "id": created[item.email]}
+            else:
+                results[index] = {"index": index, "email": item.email, "status": "conflict"}
+
+    if any(result["status"] == "created" for result in results):
+        bump_data_version(db, User.__tablename__)
+    db.commit()
+    return results
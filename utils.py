@@ -1,92 +1,324 @@
+import argparse
+import csv
+import os
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
 from faker import Faker
-import random
-
-# Initialize Faker instance
-fake = Faker()
-
-# Function to generate random player box score data
-def generate_player_box_score(game_id, athlete_id):
-    return {
-        'game_id': game_id,
-        'season': random.choice([2024, 2025]),
-        'season_type': random.choice([1, 2]),  # 1 for regular season, 2 for playoffs
-        'game_date': fake.date_this_year(),
-        'game_date_time': fake.time(),
-        'athlete_id': athlete_id,
-        'athlete_display_name': fake.name(),
-        'team_id': random.randint(1, 30),
-        'team_name': fake.company(),
-        'team_location': fake.city(),
-        'team_short_display_name': fake.word(),
-        'minutes': round(random.uniform(10.0, 40.0), 1),
-        'field_goals_made': random.randint(0, 15),
-        'field_goals_attempted': random.randint(0, 20),
-        'three_point_field_goals_made': random.randint(0, 10),
-        'three_point_field_goals_attempted': random.randint(0, 15),
-        'free_throws_made': random.randint(0, 10),
-        'free_throws_attempted': random.randint(0, 10),
-        'offensive_rebounds': random.randint(0, 5),
-        'defensive_rebounds': random.randint(0, 10),
-        'rebounds': random.randint(0, 15),
-        'assists': random.randint(0, 10),
-        'steals': random.randint(0, 5),
-        'blocks': random.randint(0, 5),
-        'turnovers': random.randint(0, 5),
-        'fouls': random.randint(0, 5),
-        'points': random.randint(0, 30),
-        'starter': random.choice(['Yes', 'No']),
-        'ejected': random.choice([None, 'Yes']),
-        'did_not_play': random.choice([None, 'Yes']),
-        'active': random.choice(['Yes', 'No']),
-        'athlete_jersey': random.randint(1, 99),
-        'athlete_short_name': fake.first_name(),
-        'athlete_headshot_href': fake.image_url(),
-        'athlete_position_name': random.choice(['Guard', 'Forward', 'Center']),
-        'athlete_position_abbreviation': random.choice(['PG', 'SG', 'SF', 'PF', 'C']),
-        'team_display_name': fake.company(),
-        'team_uid': fake.uuid4(),
-        'team_slug': fake.slug(),
-        'team_logo': fake.image_url(),
-        'team_abbreviation': fake.word().upper(),
-        'team_color': fake.color(),
-        'team_alternate_color': fake.color(),
-        'home_away': random.choice(['Home', 'Away']),
-        'team_winner': random.choice(['Yes', 'No']),
-        'team_score': random.randint(80, 130),
-        'opponent_team_id': random.randint(1, 30),
-        'opponent_team_name': fake.company(),
-        'opponent_team_location': fake.city(),
-        'opponent_team_display_name': fake.company(),
-        'opponent_team_abbreviation': fake.word().upper(),
-        'opponent_team_logo': fake.image_url(),
-        'opponent_team_color': fake.color(),
-        'opponent_team_alternate_color': fake.color(),
-        'opponent_team_score': random.randint(80, 130)
-    }
-
-# Generate multiple rows of data
-def generate_data(num_rows=30):
-    data = []
-    game_id = 1
-    for athlete_id in range(1, num_rows + 1):
-        data.append(generate_player_box_score(game_id, athlete_id))
-        game_id += 1
-    return data
-
-# Format the data into SQL INSERT statements
-def generate_sql_inserts(data):
-    sql_inserts = []
-    for row in data:
-        sql = f"INSERT INTO `player_box_score` ({', '.join(row.keys())}) VALUES ({', '.join([str(v) if v is not None else 'NULL' for v in row.values()])});"
-        sql_inserts.append(sql)
-    return sql_inserts
-
-# Generate 30 rows of data
-data = generate_data(30)
-
-# Generate SQL statements
-sql_statements = generate_sql_inserts(data)
-
-# Print SQL insert statements
-for statement in sql_statements:
-    print(statement)
+from sqlalchemy import create_engine, insert, text
+
+from database import build_insert_ignore
+from models import Base, PlayerBoxScore, Team, TeamBoxScore
+
+# Shape of the generated league
+NUM_TEAMS = 360
+ROSTER_SIZE = 13
+PLAYERS_PER_GAME = 10  # Players per team with a box-score row in each game
+SEASON_START = date(2024, 11, 4)
+SEASON_DAYS = 150
+
+# Games generated per chunk; bounds memory regardless of the total volume
+GAMES_PER_CHUNK = 5000
+
+POSITIONS = [
+    ("Point Guard", "PG"),
+    ("Shooting Guard", "SG"),
+    ("Small Forward", "SF"),
+    ("Power Forward", "PF"),
+    ("Center", "C"),
+]
+
+
+def build_team_pool(fake, num_teams=NUM_TEAMS):
+    """
+    Pre-generate team attributes once so rows only reference them by index.
+    The returned dicts are the rows of the `teams` table.
+    """
+    teams = []
+    for index in range(num_teams):
+        location = fake.city()
+        name = fake.word().title()
+        teams.append({
+            "team_id": index + 1,
+            "team_uid": f"s:40~l:41~t:{index + 1}",
+            "team_slug": f"{location}-{name}".lower().replace(" ", "-"),
+            "team_location": location,
+            "team_name": name,
+            "team_abbreviation": (location.replace(" ", "")[:3] + name[:1]).upper(),
+            "team_display_name": f"{location} {name}",
+            "team_short_display_name": location,
+            "team_color": fake.hex_color()[1:],
+            "team_alternate_color": fake.hex_color()[1:],
+            "team_logo": f"https://a.espncdn.com/i/teamlogos/ncaa/500/{index + 1}.png",
+        })
+    return teams
+
+
+def build_athlete_pool(fake, rng, num_teams=NUM_TEAMS, roster_size=ROSTER_SIZE):
+    """
+    Pre-generate a roster of athletes for every team.
+    Athlete `i` plays for team index `i // roster_size`.
+    """
+    count = num_teams * roster_size
+    positions = rng.integers(0, len(POSITIONS), size=count)
+    athletes = []
+    for index in range(count):
+        first_name, last_name = fake.first_name(), fake.last_name()
+        position_name, position_abbreviation = POSITIONS[positions[index]]
+        athletes.append({
+            "athlete_id": 1000 + index,
+            "athlete_display_name": f"{first_name} {last_name}",
+            "athlete_short_name": f"{first_name[0]}. {last_name}",
+            "athlete_jersey": int(index % roster_size * 7 % 99 + 1),
+            "athlete_headshot_href": f"https://a.espncdn.com/i/headshots/mens-college-basketball/players/full/{1000 + index}.png",
+            "athlete_position_name": position_name,
+            "athlete_position_abbreviation": position_abbreviation,
+        })
+    return athletes
+
+
+def _rows(columns):
+    """
+    Turn a dict of equal-length column arrays into a list of row dicts.
+    """
+    names = list(columns)
+    values = [np.asarray(columns[name]).tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+class BoxScoreGenerator:
+    """
+    Seeded generator of realistic `PlayerBoxScore` and `TeamBoxScore` rows.
+    Numeric columns are drawn from vectorized NumPy distributions per chunk of games;
+    team and athlete attributes come from pools built once up front.
+    - `seed`: Makes the output fully deterministic.
+    - `first_game_id`: ID of the first generated game.
+    """
+
+    def __init__(self, seed=0, first_game_id=1, num_teams=NUM_TEAMS, roster_size=ROSTER_SIZE,
+                 players_per_game=PLAYERS_PER_GAME):
+        self.rng = np.random.default_rng(seed)
+        fake = Faker()
+        fake.seed_instance(seed)
+        self.teams = build_team_pool(fake, num_teams)
+        self.athletes = build_athlete_pool(fake, self.rng, num_teams, roster_size)
+        self.first_game_id = first_game_id
+        self.roster_size = roster_size
+        self.players_per_game = players_per_game
+
+    def _games(self, start, count):
+        rng = self.rng
+        num_teams = len(self.teams)
+        game_ids = np.arange(self.first_game_id + start, self.first_game_id + start + count)
+        home = rng.integers(0, num_teams, size=count)
+        away = (home + rng.integers(1, num_teams, size=count)) % num_teams
+        days = np.sort(rng.integers(0, SEASON_DAYS, size=count))
+        dates = [SEASON_START + timedelta(days=int(day)) for day in days]
+        tipoff_hours = rng.choice([12, 14, 16, 18, 19, 20, 21], size=count)
+        return game_ids, home, away, dates, tipoff_hours
+
+    def _player_stats(self, size):
+        """
+        Draw a consistent stat line for `size` player-games.
+        """
+        rng = self.rng
+        minutes = np.round(np.clip(rng.normal(22.0, 9.0, size), 0.0, 40.0), 1)
+        field_goals_attempted = rng.poisson(minutes * 0.33)
+        threes_attempted = rng.binomial(field_goals_attempted, 0.38)
+        threes_made = rng.binomial(threes_attempted, 0.34)
+        twos_made = rng.binomial(field_goals_attempted - threes_attempted, 0.51)
+        free_throws_attempted = rng.poisson(minutes * 0.1)
+        free_throws_made = rng.binomial(free_throws_attempted, 0.71)
+        offensive_rebounds = rng.poisson(minutes * 0.04)
+        defensive_rebounds = rng.poisson(minutes * 0.11)
+        return {
+            "minutes": minutes,
+            "field_goals_made": twos_made + threes_made,
+            "field_goals_attempted": field_goals_attempted,
+            "three_point_field_goals_made": threes_made,
+            "three_point_field_goals_attempted": threes_attempted,
+            "free_throws_made": free_throws_made,
+            "free_throws_attempted": free_throws_attempted,
+            "offensive_rebounds": offensive_rebounds,
+            "defensive_rebounds": defensive_rebounds,
+            "rebounds": offensive_rebounds + defensive_rebounds,
+            "assists": rng.poisson(minutes * 0.07),
+            "steals": rng.poisson(minutes * 0.03),
+            "blocks": rng.poisson(minutes * 0.02),
+            "turnovers": rng.poisson(minutes * 0.05),
+            "fouls": np.minimum(rng.poisson(minutes * 0.07), 5),
+            "points": 2 * twos_made + 3 * threes_made + free_throws_made,
+        }
+
+    def _chunk(self, start, count):
+        rng = self.rng
+        per_game = self.players_per_game
+        game_ids, home, away, dates, tipoff_hours = self._games(start, count)
+
+        # One row per (game, side, player); side 0 is the home team
+        size = count * 2 * per_game
+        game_index = np.repeat(np.arange(count), 2 * per_game)
+        side = np.tile(np.repeat([0, 1], per_game), count)
+        team_index = np.where(side == 0, home[game_index], away[game_index])
+        opponent_index = np.where(side == 0, away[game_index], home[game_index])
+
+        # Pick distinct roster spots per team-game by shuffling slot order
+        slots = rng.random((count * 2, self.roster_size)).argsort(axis=1)[:, :per_game].reshape(-1)
+        athlete_index = team_index * self.roster_size + slots
+
+        stats = self._player_stats(size)
+        team_points = np.bincount(np.arange(size) // per_game, weights=stats["points"], minlength=count * 2)
+        team_points = team_points.reshape(count, 2).astype(int)
+        home_won = team_points[:, 0] > team_points[:, 1]
+        team_score = team_points[game_index, side]
+        opponent_score = team_points[game_index, 1 - side]
+
+        starter = np.tile(np.arange(per_game) < 5, count * 2)
+        columns = {
+            "game_id": game_ids[game_index],
+            "athlete_id": [self.athletes[index]["athlete_id"] for index in athlete_index],
+            "season": np.full(size, SEASON_START.year + 1),
+            "season_type": np.full(size, 2),
+            "game_date": [dates[index] for index in game_index],
+            "game_date_time": [datetime.combine(dates[index], time(int(tipoff_hours[index]))) for index in game_index],
+            "team_id": team_index + 1,
+            "opponent_team_id": opponent_index + 1,
+            **stats,
+            "starter": np.where(starter, "true", "false"),
+            "ejected": np.full(size, "false"),
+            "did_not_play": np.where(stats["minutes"] > 0, "false", "true"),
+            "active": np.full(size, "true"),
+            "home_away": np.where(side == 0, "home", "away"),
+            "team_winner": np.where(home_won[game_index] == (side == 0), "true", "false"),
+            "team_score": team_score,
+            "opponent_team_score": opponent_score,
+        }
+        for name in ("athlete_display_name", "athlete_short_name", "athlete_jersey", "athlete_headshot_href",
+                     "athlete_position_name", "athlete_position_abbreviation"):
+            columns[name] = [self.athletes[index][name] for index in athlete_index]
+        player_columns = {name: values for name, values in columns.items() if name in PlayerBoxScore.__table__.c}
+
+        # team_box_score is keyed on game_id alone, so it holds the home team's line
+        home_first_row = np.arange(count) * 2 * per_game
+
+        def home_totals(name):
+            return np.bincount(np.arange(size) // per_game, weights=stats[name],
+                               minlength=count * 2).reshape(count, 2)[:, 0].astype(int)
+
+        team_columns = {
+            name: [values[index] for index in home_first_row] if isinstance(values, list)
+            else np.asarray(values)[home_first_row]
+            for name, values in columns.items()
+            if name in TeamBoxScore.__table__.c
+        }
+        for name in ("assists", "blocks", "defensive_rebounds", "offensive_rebounds", "steals", "turnovers",
+                     "fouls", "field_goals_made", "field_goals_attempted", "three_point_field_goals_made",
+                     "three_point_field_goals_attempted", "free_throws_made", "free_throws_attempted"):
+            team_columns[name] = home_totals(name)
+        team_columns["total_rebounds"] = home_totals("rebounds")
+        team_columns["team_home_away"] = np.full(count, "home")
+        for pct, made, attempted in (
+            ("field_goal_pct", "field_goals_made", "field_goals_attempted"),
+            ("three_point_field_goal_pct", "three_point_field_goals_made", "three_point_field_goals_attempted"),
+            ("free_throw_pct", "free_throws_made", "free_throws_attempted"),
+        ):
+            team_columns[pct] = np.round(100 * team_columns[made] / np.maximum(team_columns[attempted], 1), 1)
+
+        return _rows(player_columns), _rows(team_columns)
+
+    def generate(self, num_games, games_per_chunk=GAMES_PER_CHUNK):
+        """
+        Yield `(player_rows, team_rows)` chunks covering `num_games` games.
+        """
+        for start in range(0, num_games, games_per_chunk):
+            yield self._chunk(start, min(games_per_chunk, num_games - start))
+
+
+def load_rows(engine, model, rows, batch_size=5000):
+    """
+    Insert `rows` into the table of `model` with batched, parameterized executemany calls.
+    """
+    table = model.__table__
+    with engine.begin() as connection:
+        for start in range(0, len(rows), batch_size):
+            connection.execute(insert(table), rows[start:start + batch_size])
+    return len(rows)
+
+
+def load_teams(engine, teams):
+    """
+    Insert the team dimension rows, keeping teams that already exist.
+    """
+    with engine.begin() as connection:
+        connection.execute(build_insert_ignore(engine.dialect.name, Team.__table__, teams))
+    return len(teams)
+
+
+def write_csv(path, rows, append=False):
+    """
+    Write row dicts to a CSV file suitable for `LOAD DATA LOCAL INFILE`; NULLs become `\\N`.
+    """
+    if not rows:
+        return 0
+    names = list(rows[0])
+    with open(path, "a" if append else "w", newline="") as csv_file:
+        writer = csv.writer(csv_file, lineterminator="\n")
+        if not append:
+            writer.writerow(names)
+        writer.writerows(["\\N" if row[name] is None else row[name] for name in names] for row in rows)
+    return len(rows)
+
+
+def load_csv(engine, model, path):
+    """
+    Bulk-load a CSV produced by `write_csv` into MySQL with `LOAD DATA LOCAL INFILE`.
+    The engine must be created with `connect_args={"local_infile": True}`.
+    """
+    with open(path, newline="") as csv_file:
+        names = next(csv.reader(csv_file))
+    statement = text(
+        f"LOAD DATA LOCAL INFILE :path INTO TABLE `{model.__tablename__}` "
+        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+        f"IGNORE 1 LINES ({', '.join(f'`{name}`' for name in names)})"
+    )
+    with engine.begin() as connection:
+        return connection.execute(statement, {"path": os.path.abspath(path)}).rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and load synthetic box-score fixtures.")
+    parser.add_argument("--games", type=int, default=1000, help="Number of games to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--database-url", default="sqlite:///fixtures.db", help="Target database URL")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per executemany batch")
+    parser.add_argument("--csv-dir", help="Write CSV files here (and LOAD DATA them on MySQL) instead of inserting")
+    args = parser.parse_args()
+
+    connect_args = {"local_infile": True} if args.database_url.startswith("mysql") else {}
+    engine = create_engine(args.database_url, connect_args=connect_args)
+    Base.metadata.create_all(bind=engine, tables=[Team.__table__, PlayerBoxScore.__table__, TeamBoxScore.__table__])
+
+    generator = BoxScoreGenerator(seed=args.seed)
+    load_teams(engine, generator.teams)
+    totals = {"teams": len(generator.teams), "player_box_score": 0, "team_box_score": 0}
+    for index, (player_rows, team_rows) in enumerate(generator.generate(args.games)):
+        if args.csv_dir:
+            os.makedirs(args.csv_dir, exist_ok=True)
+            totals["player_box_score"] += write_csv(
+                os.path.join(args.csv_dir, "player_box_score.csv"), player_rows, append=index > 0)
+            totals["team_box_score"] += write_csv(
+                os.path.join(args.csv_dir, "team_box_score.csv"), team_rows, append=index > 0)
+        else:
+            totals["player_box_score"] += load_rows(engine, PlayerBoxScore, player_rows, args.batch_size)
+            totals["team_box_score"] += load_rows(engine, TeamBoxScore, team_rows, args.batch_size)
+
+    if args.csv_dir and engine.dialect.name == "mysql":
+        load_csv(engine, PlayerBoxScore, os.path.join(args.csv_dir, "player_box_score.csv"))
+        load_csv(engine, TeamBoxScore, os.path.join(args.csv_dir, "team_box_score.csv"))
+
+    for table_name, count in totals.items():
+        print(f"{table_name}: {count} rows")
+
+
+if __name__ == "__main__":
+    main()